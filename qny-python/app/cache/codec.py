@@ -0,0 +1,32 @@
+"""
+缓存/响应的序列化编解码
+统一使用 orjson 处理 JSON 字节，不使用 pickle
+"""
+from typing import Any, Optional, Type, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+
+M = TypeVar("M", bound=BaseModel)
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """orjson 不认识的类型：pydantic 模型转为 JSON 兼容的 dict"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """序列化为 JSON 字节"""
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+
+def loads(data: bytes, model: Optional[Type[M]] = None) -> Any:
+    """反序列化 JSON 字节；指定模型时直接用 model_validate_json 一次完成解析与校验"""
+    if model is None:
+        return orjson.loads(data)
+    return model.model_validate_json(data)
@@ -5,13 +5,24 @@ from .config import settings
 
 
 connect_args = {}
+pool_args = {}
 if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
+else:
+    # 复用连接，避免每个请求重新建立连接；定期回收以免被服务端超时断开
+    pool_args = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+    }
 
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
     connect_args=connect_args,
+    # 已编译语句缓存：应用中的查询语句种类较多，默认的 500 条容易被挤出后重新编译
+    query_cache_size=settings.db_query_cache_size,
+    **pool_args,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -2,10 +2,19 @@
 统一响应格式模块
 """
 from typing import Any, Dict, List, Optional, Union
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from app.cache import codec
 from app.core.constants import ResponseCode
 
 
+class ORJSONResponse(JSONResponse):
+    """基于 orjson 的 JSON 响应，作为应用默认响应类"""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
+
+
 class APIResponse(BaseModel):
     """统一API响应格式"""
     code: int = Field(..., description="响应状态码")
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, func
 from sqlalchemy.orm import relationship
 
@@ -19,6 +21,11 @@ class Document(Base):
         return f"<Document(doc_id='{self.doc_id}')>"
 
 
+def _default_session_title() -> str:
+    """未指定标题时的默认会话标题，仅在插入时由 SQLAlchemy 调用"""
+    return f"新对话 {datetime.now():%Y-%m-%d %H:%M}"
+
+
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
 
@@ -26,7 +33,7 @@ class ChatSession(Base):
     session_id = Column(String(64), unique=True, nullable=False, index=True)  # 聊天会话唯一ID
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=True, index=True)
-    title = Column(String(200), nullable=True)  # 聊天会话标题
+    title = Column(String(200), nullable=True, default=_default_session_title)  # 聊天会话标题
     is_active = Column(Boolean, default=True)  # 会话是否活跃
     session_metadata = Column(JSON, nullable=True)  # 会话元数据
     message_count = Column(Integer, default=0)  # 消息数量
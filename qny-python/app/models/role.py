@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, func, case
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from ..core.db import Base
@@ -45,6 +46,31 @@ class Role(Base):
     chat_messages = relationship("ChatMessage", back_populates="role")
     chat_sessions = relationship("ChatSession", back_populates="role")
 
+    # 成长指标：实例上按已加载的计数直接计算，类上为等价的 SQL 表达式，可用于查询中的排序和筛选
+    @hybrid_property
+    def satisfaction_rate(self) -> float:
+        """满意度（好评占比，百分比），没有反馈时默认为75"""
+        total_feedbacks = self.positive_feedback + self.negative_feedback
+        if total_feedbacks == 0:
+            return 75.0
+        return (self.positive_feedback / total_feedbacks) * 100
+
+    @satisfaction_rate.expression
+    def satisfaction_rate(cls):
+        total_feedbacks = cls.positive_feedback + cls.negative_feedback
+        return case((total_feedbacks == 0, 75.0), else_=cls.positive_feedback * 100.0 / total_feedbacks)
+
+    @hybrid_property
+    def growth_rate(self) -> float:
+        """成长率：平均每次对话获得的经验值"""
+        if self.total_conversations == 0:
+            return 0.0
+        return self.experience / self.total_conversations
+
+    @growth_rate.expression
+    def growth_rate(cls):
+        return case((cls.total_conversations == 0, 0.0), else_=cls.experience * 1.0 / cls.total_conversations)
+
     def __repr__(self):
         return f"<Role(id={self.id}, name='{self.name}')>"
 
@@ -3,17 +3,21 @@ from datetime import datetime
 import uuid
 
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from ..core.db import get_db
+from ..core.db import SessionLocal, get_db
+from ..core.response import ORJSONResponse
 from ..core.security import get_current_user
 from ..models.user import User
 from ..schemas.chat import (
     ChatRequest, ChatResponse, ChatSessionCreate,
     ChatMessageCreate, ChatHistoryRequest, ChatHistoryResponse,
-    ChatSessionResponse, ChatMessageResponse, TTSRequest
+    ChatSessionResponse, ChatMessageResponse, TTSRequest,
+    CHAT_SESSION_LIST_ADAPTER, CHAT_MESSAGE_LIST_ADAPTER
 )
-from ..services.llm_service import generate_reply
+from ..services.llm_service import generate_reply, stream_reply
 from ..services.stt_service import transcribe_audio
 from ..services.tts_service import synthesize_speech
 from ..services.chat_service import ChatService
@@ -22,11 +26,73 @@ from ..services.growth_service import GrowthService
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# 生成回复时最多读取的历史消息条数
+_HISTORY_MESSAGES = 20
+
 
 def get_chat_service(db: Session = Depends(get_db)) -> ChatService:
     return ChatService(db)
 
 
+def _prepare_chat(payload: ChatRequest, user_id: int, chat_service: ChatService):
+    """
+    校验输入、获取或创建会话并保存用户消息
+    返回: (session_id, 用于生成回复的会话历史)
+    """
+    # 输入验证
+    if not payload.content or not payload.content.strip():
+        raise HTTPException(status_code=422, detail="消息内容不能为空")
+
+    # 获取或创建会话
+    session_id = payload.session_id
+    if not session_id:
+        # 创建新会话
+        session_data = ChatSessionCreate(role_id=payload.role_id)
+        session = chat_service.create_session(user_id, session_data)
+        session_id = session.session_id
+    else:
+        # 验证会话是否存在
+        session = chat_service.get_session(session_id, user_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="会话不存在")
+
+    # 保存用户消息
+    user_message = ChatMessageCreate(
+        session_id=session_id,
+        role_id=payload.role_id,
+        content=payload.content.strip(),
+        is_user_message=True
+    )
+    chat_service.save_message(user_message, user_id)
+
+    # 获取最近的会话历史用于AI回复，发送前再由 llm_service 按长度预算截断
+    session_messages = chat_service.get_recent_messages(session_id, limit=_HISTORY_MESSAGES)
+    messages = []
+    for msg in session_messages:
+        role = "user" if msg.is_user_message else "assistant"
+        messages.append({"role": role, "content": msg.content})
+
+    return session_id, messages
+
+
+def _finish_chat(payload: ChatRequest, user_id: int, session_id: str, reply: str,
+                 db: Session, chat_service: ChatService, truncated: bool = False) -> None:
+    """保存AI回复并记录对话成长，truncated 表示回复未完整生成（流式输出中途中断）"""
+    # 保存AI回复
+    assistant_message = ChatMessageCreate(
+        session_id=session_id,
+        role_id=payload.role_id,
+        content=reply,
+        is_user_message=False,
+        message_metadata={"truncated": True} if truncated else None
+    )
+    chat_service.save_message(assistant_message, user_id)
+
+    # 记录对话并计算成长
+    growth_service = GrowthService(db)
+    growth_service.record_conversation(payload.role_id, user_id, session_id)
+
+
 @router.post("/text", response_model=ChatResponse)
 def chat_text(
     payload: ChatRequest,
@@ -37,55 +103,12 @@ def chat_text(
     """文本聊天接口，自动保存聊天历史"""
     try:
         user_id = current_user.id
-
-        # 输入验证
-        if not payload.content or not payload.content.strip():
-            raise HTTPException(status_code=422, detail="消息内容不能为空")
-
-        # 获取或创建会话
-        session_id = payload.session_id
-        if not session_id:
-            # 创建新会话
-            session_data = ChatSessionCreate(role_id=payload.role_id)
-            session = chat_service.create_session(user_id, session_data)
-            session_id = session.session_id
-        else:
-            # 验证会话是否存在
-            session = chat_service.get_session(session_id, user_id)
-            if not session:
-                raise HTTPException(status_code=404, detail="会话不存在")
-
-        # 保存用户消息
-        user_message = ChatMessageCreate(
-            session_id=session_id,
-            role_id=payload.role_id,
-            content=payload.content.strip(),
-            is_user_message=True
-        )
-        chat_service.save_message(user_message, user_id)
-
-        # 获取会话历史用于AI回复（限制上下文长度以提高性能）
-        session_messages = chat_service.get_session_messages(session_id, user_id, limit=10)
-        messages = []
-        for msg in session_messages:
-            role = "user" if msg.is_user_message else "assistant"
-            messages.append({"role": role, "content": msg.content})
+        session_id, messages = _prepare_chat(payload, user_id, chat_service)
 
         # 生成AI回复（传入角色ID和数据库会话）
         reply = generate_reply(messages, payload.role_id, db)
 
-        # 保存AI回复
-        assistant_message = ChatMessageCreate(
-            session_id=session_id,
-            role_id=payload.role_id,
-            content=reply,
-            is_user_message=False
-        )
-        chat_service.save_message(assistant_message, user_id)
-
-        # 记录对话并计算成长
-        growth_service = GrowthService(db)
-        growth_service.record_conversation(payload.role_id, user_id, session_id)
+        _finish_chat(payload, user_id, session_id, reply, db, chat_service)
 
         return ChatResponse(role="assistant", content=reply, session_id=session_id)
 
@@ -99,6 +122,57 @@ def chat_text(
         raise HTTPException(status_code=500, detail="服务器内部错误")
 
 
+@router.post("/text/stream")
+def chat_text_stream(
+    payload: ChatRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    流式文本聊天接口：回复内容边生成边以纯文本分块返回，会话ID放在 X-Session-Id 响应头中；
+    输出结束后保存聊天历史并记录成长，客户端断开或上游中途出错时保存已生成的部分并标记为不完整
+    """
+    try:
+        user_id = current_user.id
+        session_id, messages = _prepare_chat(payload, user_id, chat_service)
+
+        # 连接LLM失败时在开始输出前返回错误
+        chunks = stream_reply(messages, payload.role_id, db)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        import logging
+        logging.error(f"流式聊天接口错误: {str(e)}")
+        raise HTTPException(status_code=500, detail="服务器内部错误")
+
+    def body():
+        parts = []
+        completed = False
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            completed = True
+        finally:
+            if parts:
+                # 响应开始后不再依赖请求作用域的数据库会话，使用独立会话保存
+                try:
+                    with SessionLocal() as stream_db:
+                        _finish_chat(payload, user_id, session_id, "".join(parts), stream_db,
+                                     ChatService(stream_db), truncated=not completed)
+                except Exception as e:
+                    import logging
+                    logging.error(f"保存流式聊天回复失败: {str(e)}")
+
+    return StreamingResponse(
+        body(),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-Session-Id": session_id}
+    )
+
+
 @router.post("/session", response_model=ChatSessionResponse)
 def create_session(
     session_data: ChatSessionCreate,
@@ -156,11 +230,12 @@ def get_chat_history(
     """获取聊天历史"""
     user_id = current_user.id
     history = chat_service.get_chat_history(user_id, request)
-    return ChatHistoryResponse(
-        sessions=history["sessions"],
-        messages=history["messages"],
+    # 直接返回响应对象，跳过 response_model 的二次校验和 jsonable_encoder
+    return ORJSONResponse(ChatHistoryResponse(
+        sessions=CHAT_SESSION_LIST_ADAPTER.validate_python(history["sessions"], from_attributes=True),
+        messages=CHAT_MESSAGE_LIST_ADAPTER.validate_python(history["messages"], from_attributes=True),
         total=history["total"]
-    )
+    ))
 
 
 @router.delete("/session/{session_id}")
@@ -202,7 +277,8 @@ def update_session_title(
 async def speech_to_text(file: UploadFile = File(...)):
     """语音转文字"""
     data = await file.read()
-    text = transcribe_audio(data)
+    # 语音识别是同步 HTTP 调用，放到线程池执行，不阻塞事件循环
+    text = await run_in_threadpool(transcribe_audio, data)
     return {"text": text}
 
 
@@ -5,8 +5,8 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import distinct
-from datetime import datetime
+from sqlalchemy import distinct, desc, func
+from datetime import datetime, timezone
 
 from ..core.security import get_current_user
 from ..core.db import get_db
@@ -17,11 +17,24 @@ from ..schemas.growth import (
     SkillUpdateResponse, UserFeedbackStats, GrowthStats, FeedbackReason,
     LevelInfo, SkillProgress, GrowthHistory
 )
-from ..services.growth_service import GrowthService
+from ..services.growth_service import GrowthService, FEEDBACK_SCORE
+from ..services import leaderboard_cache
 
 router = APIRouter(prefix="/growth", tags=["growth"])
 
 
+def _leaderboard_row(role: Role) -> dict:
+    return {
+        'role_id': role.id,
+        'role_name': role.name,
+        'level': role.level,
+        'experience': role.experience,
+        'total_conversations': role.total_conversations,
+        'positive_feedback': role.positive_feedback,
+        'negative_feedback': role.negative_feedback,
+    }
+
+
 @router.post("/feedback", response_model=FeedbackResponse)
 async def create_feedback(
     feedback: FeedbackCreate,
@@ -137,13 +150,44 @@ async def get_growth_leaderboard(
     """
     获取成长排行榜
     """
+    # 等级由经验值单调决定，两种排序都直接读 Redis 有序集合
+    if sort_by in ("experience", "level"):
+        query = db.query(Role).filter(Role.total_conversations > 0).order_by(
+            Role.experience.desc(), Role.level.desc(), Role.id
+        )
+        try:
+            rows = leaderboard_cache.top(limit)
+        except leaderboard_cache.LeaderboardUnavailable:
+            # Redis 不可用：只查询需要的前 limit 名，不做全量重建
+            rows = [_leaderboard_row(role) for role in query.limit(limit).all()]
+        if rows is None:
+            # 排行榜未建立或已到期：从数据库全量重建一次
+            active_roles = query.all()
+            leaderboard_cache.rebuild(active_roles)
+            rows = [_leaderboard_row(role) for role in active_roles[:limit]]
+
+        leaderboard = []
+        for rank, row in enumerate(rows, 1):
+            total_feedback = row['positive_feedback'] + row['negative_feedback']
+            satisfaction_rate = (row['positive_feedback'] / total_feedback) * 100 if total_feedback > 0 else 0
+
+            leaderboard.append(GrowthLeaderboard(
+                role_id=row['role_id'],
+                role_name=row['role_name'],
+                level=row['level'],
+                experience=row['experience'],
+                total_conversations=row['total_conversations'],
+                satisfaction_rate=satisfaction_rate,
+                rank=rank
+            ))
+
+        return leaderboard
+
     # 查询活跃角色（有对话记录的角色）
     query = db.query(Role).filter(Role.total_conversations > 0)
 
     # 排序
-    if sort_by == "level":
-        query = query.order_by(Role.level.desc(), Role.experience.desc())
-    elif sort_by == "satisfaction_rate":
+    if sort_by == "satisfaction_rate":
         # 计算满意度并排序
         query = query.order_by(
             (Role.positive_feedback * 1.0 /
@@ -222,49 +266,29 @@ async def get_my_feedback_stats(
     """
     获取用户反馈统计
     """
-    # 统计用户反馈
-    feedbacks = db.query(UserFeedback).filter(UserFeedback.user_id == current_user.id).all()
-
-    total_given = len(feedbacks)
-    satisfaction_score = 0
-
-    for feedback in feedbacks:
-        if feedback.feedback_type == 'like':
-            satisfaction_score += 5
-        elif feedback.feedback_type == 'dislike':
-            satisfaction_score += 1
-        elif feedback.rating:
-            satisfaction_score += feedback.rating
+    # 统计用户反馈：计数和满意度得分都在数据库中聚合
+    total_given, satisfaction_score = db.query(
+        func.count(), func.sum(FEEDBACK_SCORE)
+    ).filter(UserFeedback.user_id == current_user.id).one()
+    satisfaction_score = int(satisfaction_score or 0)
 
     satisfaction_rate = (satisfaction_score / (total_given * 5)) * 100 if total_given > 0 else 75.0
 
-    # 统计最喜欢的角色
+    # 统计最喜欢的角色：按角色分组累加得分，取得分最高的5个
+    role_score = func.sum(FEEDBACK_SCORE)
     favorite_roles_query = db.query(
         Role.id,
         Role.name,
-        UserFeedback.feedback_type,
-        UserFeedback.rating
-    ).join(UserFeedback).filter(UserFeedback.user_id == current_user.id).all()
-
-    role_scores = {}
-    for role_id, role_name, feedback_type, rating in favorite_roles_query:
-        if role_id not in role_scores:
-            role_scores[role_id] = {'name': role_name, 'score': 0, 'count': 0}
-
-        if feedback_type == 'like':
-            role_scores[role_id]['score'] += 5
-        elif feedback_type == 'dislike':
-            role_scores[role_id]['score'] += 1
-        elif rating:
-            role_scores[role_id]['score'] += rating
-
-        role_scores[role_id]['count'] += 1
-
-    favorite_roles = sorted(
-        [{'role_id': rid, **data} for rid, data in role_scores.items()],
-        key=lambda x: x['score'],
-        reverse=True
-    )[:5]
+        role_score,
+        func.count()
+    ).join(UserFeedback).filter(
+        UserFeedback.user_id == current_user.id
+    ).group_by(Role.id, Role.name).order_by(desc(role_score)).limit(5).all()
+
+    favorite_roles = [
+        {'role_id': role_id, 'name': role_name, 'score': int(score or 0), 'count': count}
+        for role_id, role_name, score, count in favorite_roles_query
+    ]
 
     # 趋势分析
     trend = "反馈积极" if satisfaction_rate > 70 else "反馈一般" if satisfaction_rate > 50 else "需要改进"
@@ -333,7 +357,7 @@ async def get_role_growth_stats(
     获取角色成长统计
     """
     try:
-        role = db.query(Role).filter(Role.id == role_id).first()
+        role = db.get(Role, role_id)
         if not role:
             raise HTTPException(status_code=404, detail="角色不存在")
 
@@ -388,8 +412,13 @@ async def get_role_growth_stats(
                 if isinstance(history_data, list):
                     for activity in history_data[-10:]:  # 最近10条
                         try:
+                            # 新记录的时间为整数秒 ts，旧记录为 ISO 字符串 timestamp
+                            if 'ts' in activity:
+                                timestamp = datetime.fromtimestamp(activity['ts'], tz=timezone.utc)
+                            else:
+                                timestamp = activity.get('timestamp', datetime.now())
                             recent_activities.append(GrowthHistory(
-                                timestamp=activity.get('timestamp', datetime.now()),
+                                timestamp=timestamp,
                                 event_type=activity.get('event_type', 'unknown'),
                                 description=activity.get('description', ''),
                                 metadata=activity.get('metadata', {})
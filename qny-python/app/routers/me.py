@@ -7,6 +7,7 @@ from sqlalchemy import and_, desc, func
 
 from ..core.config import settings
 from ..core.db import get_db
+from ..core.response import ORJSONResponse
 from ..models.user import User
 from ..models.role import UserRole, Role
 from ..models.chat import ChatSession, ChatMessage
@@ -14,7 +15,8 @@ from ..schemas.user import UserOut
 from ..schemas.role import UserRoleOut
 from ..schemas.chat import (
     ChatHistoryRequest, ChatHistoryResponse,
-    ChatSessionResponse, ChatMessageResponse
+    ChatSessionResponse, ChatMessageResponse,
+    CHAT_SESSION_LIST_ADAPTER, CHAT_MESSAGE_LIST_ADAPTER
 )
 from ..services.chat_service import ChatService
 
@@ -80,11 +82,12 @@ def get_chat_history(
     )
     chat_service = ChatService(db)
     history = chat_service.get_chat_history(current_user.id, request)
-    return ChatHistoryResponse(
-        sessions=history["sessions"],
-        messages=history["messages"],
+    # 直接返回响应对象，跳过 response_model 的二次校验和 jsonable_encoder
+    return ORJSONResponse(ChatHistoryResponse(
+        sessions=CHAT_SESSION_LIST_ADAPTER.validate_python(history["sessions"], from_attributes=True),
+        messages=CHAT_MESSAGE_LIST_ADAPTER.validate_python(history["messages"], from_attributes=True),
         total=history["total"]
-    )
+    ))
 
 
 @router.get("/me/sessions", response_model=List[ChatSessionResponse])
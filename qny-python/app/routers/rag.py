@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from ..services.rag_service import rag, rebuild_from_db
 from ..core.db import get_db
 from ..models.chat import Document
-from ..services.doc_service import extract_text_from_pdf, extract_text_from_markdown, extract_text_from_json, chunk_text
+from ..services.doc_service import iter_text_from_pdf, extract_text_from_markdown, extract_text_from_json, iter_chunks
 
 
 router = APIRouter(prefix="/rag", tags=["rag"])
@@ -64,18 +64,18 @@ async def upload_and_index(file: UploadFile = File(...), prefix: str = "upload/"
     name = file.filename or "file"
     ext = (name.rsplit(".", 1)[-1] or "").lower()
     
-    # 根据文件扩展名选择解析方法
+    # 根据文件扩展名选择解析方法；PDF 逐页产出文本并流式切块，不拼接整份文档
     if ext in ("pdf",):
-        text = extract_text_from_pdf(data)
+        texts = iter_text_from_pdf(data)
     elif ext in ("md", "markdown"):
-        text = extract_text_from_markdown(data)
+        texts = [extract_text_from_markdown(data)]
     elif ext in ("json", "jsonl"):
-        text = extract_text_from_json(data)
+        texts = [extract_text_from_json(data)]
     else:
         # 默认尝试按 UTF-8 文本解析
-        text = data.decode("utf-8", errors="ignore")
+        texts = [data.decode("utf-8", errors="ignore")]
     
-    chunks = chunk_text(text, max_len=chunk_size)
+    chunks = list(iter_chunks(texts, max_len=chunk_size))
     ids = [f"{prefix}{name}#p{i+1}" for i in range(len(chunks))]
     
     # upsert 到 DB
@@ -89,7 +89,10 @@ async def upload_and_index(file: UploadFile = File(...), prefix: str = "upload/"
     db.commit()
     rows = db.query(Document.doc_id, Document.text).all()
     rebuild_from_db(rows)
-    return {"ok": True, "count": len(ids), "doc_ids": ids, "file_type": ext, "extracted_text_preview": text[:200] + "..." if len(text) > 200 else text}
+    preview = chunks[0] if chunks else ""
+    if len(preview) > 200 or len(chunks) > 1:
+        preview = preview[:200] + "..."
+    return {"ok": True, "count": len(ids), "doc_ids": ids, "file_type": ext, "extracted_text_preview": preview}
 
 
 @router.post("/search")
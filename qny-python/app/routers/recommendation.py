@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 
 from ..core.db import get_db
+from ..core.response import ORJSONResponse
 from ..core.security import get_current_user
 from ..models.user import User
 from ..schemas.recommendation import (
@@ -46,19 +47,22 @@ def get_role_recommendations(
         else:  # hybrid
             recommendations_data = recommendation_service.get_hybrid_recommendations(user_id, limit)
 
-        # 转换为响应格式
+        # 转换为响应格式：角色列表一次性交给 ROLE_LIST_ADAPTER 校验
         from ..schemas.recommendation import RecommendationItem
-        from ..schemas.role import RoleOut
+        from ..schemas.role import ROLE_LIST_ADAPTER
 
-        recommendation_items = []
-        for rec_data in recommendations_data:
-            role_out = RoleOut.from_orm(rec_data["role"])
-            recommendation_item = RecommendationItem(
+        role_outs = ROLE_LIST_ADAPTER.validate_python(
+            [rec_data["role"] for rec_data in recommendations_data],
+            from_attributes=True
+        )
+        recommendation_items = [
+            RecommendationItem(
                 role=role_out,
                 score=rec_data["score"],
                 reason=rec_data["reason"]
             )
-            recommendation_items.append(recommendation_item)
+            for role_out, rec_data in zip(role_outs, recommendations_data)
+        ]
 
         # 获取用户画像摘要
         user_profile = recommendation_service.get_user_behavior_analysis(user_id)
@@ -68,12 +72,13 @@ def get_role_recommendations(
             "favorite_tags": user_profile["favorite_tags"][:5]
         }
 
-        return RecommendationResponse(
+        # 直接返回响应对象，跳过 response_model 对整份角色列表的二次校验和 jsonable_encoder
+        return ORJSONResponse(RecommendationResponse(
             recommendations=recommendation_items,
             total_count=len(recommendation_items),
             algorithm_used=algorithm,
             user_profile_summary=profile_summary
-        )
+        ))
 
     except Exception as e:
         raise HTTPException(
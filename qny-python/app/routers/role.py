@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Query, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Query, Depends, HTTPException, UploadFile, File, Request, Response
 from sqlalchemy.orm import Session
 import json
 
-from prompt_templates import ROLE_PROMPTS, BUILTIN_ROLES
+from prompt_templates import ROLE_PROMPTS, BUILTIN_ROLES, BUILTIN_ROLE_INFOS
 from ..core.db import get_db
 from ..models.role import Role
 from ..models.user import User
 from ..core.security import get_current_user
-from ..schemas.role import RoleInfo, RoleTemplateCreate, RoleTemplateUpdate, RoleTemplateOut, RoleTemplate
+from ..schemas.role import RoleInfo, RoleTemplateCreate, RoleTemplateUpdate, RoleTemplateOut, RoleTemplate, ROLE_INFO_LIST_ADAPTER
 from ..services.oss_service import get_oss_service
+from ..services import response_cache
+from ..services.llm_service import invalidate_role_prompt
 
 
 router = APIRouter(prefix="/role", tags=["role"])
@@ -33,17 +35,34 @@ async def upload_avatar(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"上传失败: {str(e)}")
 
 
+# 角色列表展示的列
+_ROLE_LIST_COLUMNS = (
+    Role.id, Role.name, Role.display_name, Role.description, Role.avatar_url, Role.skills,
+    Role.background, Role.personality, Role.category, Role.tags, Role.is_public, Role.created_at,
+)
+
+
 @router.get("/list", response_model=list[RoleInfo])
-def list_roles(db: Session = Depends(get_db)):
+def list_roles(request: Request, db: Session = Depends(get_db)):
     """获取所有角色列表（包含数据库中的实际角色）"""
+    public_filter = (Role.is_public == True, Role.is_active == True)
+
+    # 只读取列表中展示的列，并以这些列的内容作为版本号；不使用 updated_at，
+    # 它会随每次对话、反馈更新的成长计数变化，而这些计数不在列表中
+    db_roles = db.query(*_ROLE_LIST_COLUMNS).filter(*public_filter).order_by(Role.id).all()
+    etag = response_cache.make_etag("role:list", *db_roles)
+    headers = {"ETag": etag}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    cached = response_cache.get_cached("role:list", etag)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+
     results = []
     
-    # 获取数据库中的所有公开角色
-    db_roles = db.query(Role).filter(
-        Role.is_public == True,
-        Role.is_active == True
-    ).all()
-    
+    # 数据库中的所有公开角色
     for role in db_roles:
         # 解析技能和标签
         skills = []
@@ -77,26 +96,13 @@ def list_roles(db: Session = Depends(get_db)):
             created_at=role.created_at
         ))
     
-    # 如果没有数据库角色，返回内置角色模板
+    # 如果没有数据库角色，返回内置角色模板（内置角色没有ID）
     if not results:
-        for name, info in BUILTIN_ROLES.items():
-            results.append(RoleInfo(
-                id=None,  # 内置角色没有ID
-                name=name,
-                display_name=info["display_name"],
-                description=info["description"],
-                avatar_url=info["avatar_url"],
-                skills=info["skills"],
-                background=info["background"],
-                personality=info["personality"],
-                category=info["category"],
-                tags=info["tags"],
-                is_builtin=True,
-                is_public=True,
-                created_at=None
-            ))
+        results.extend(BUILTIN_ROLE_INFOS.values())
     
-    return results
+    body = ROLE_INFO_LIST_ADAPTER.dump_json(results)
+    response_cache.set_cached("role:list", etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/create-from-template", response_model=RoleInfo)
@@ -171,6 +177,8 @@ def create_role_from_template(
     db.add(new_role)
     db.commit()
     db.refresh(new_role)
+    # 该 ID 之前若被查询过，缓存中是"角色不存在"，创建后需清除
+    invalidate_role_prompt(new_role.id)
     
     return RoleInfo(
         id=new_role.id,
@@ -196,18 +204,9 @@ def search_roles(q: str = Query(""), db: Session = Depends(get_db)):
     results = []
     
     # 搜索内置角色
-    for name, info in BUILTIN_ROLES.items():
-        if q_lower in name.lower() or q_lower in info["display_name"].lower():
-            results.append(RoleInfo(
-                name=name,
-                display_name=info["display_name"],
-                description=info["description"],
-                avatar_url=info["avatar_url"],
-                skills=info["skills"],
-                background=info["background"],
-                personality=info["personality"],
-                is_builtin=True
-            ))
+    for name, info in BUILTIN_ROLE_INFOS.items():
+        if q_lower in name.lower() or q_lower in info.display_name.lower():
+            results.append(info)
     
     # 搜索自定义角色
     customs = db.query(RoleTemplate).filter(RoleTemplate.name.like(f"%{q}%")).all()
@@ -231,18 +230,8 @@ def search_roles(q: str = Query(""), db: Session = Depends(get_db)):
 def get_role_template(name: str, db: Session = Depends(get_db)):
     """获取角色模板，返回完整的角色信息"""
     # 先检查内置角色
-    if name in BUILTIN_ROLES:
-        info = BUILTIN_ROLES[name]
-        return RoleInfo(
-            name=name,
-            display_name=info["display_name"],
-            description=info["description"],
-            avatar_url=info["avatar_url"],
-            skills=info["skills"],
-            background=info["background"],
-            personality=info["personality"],
-            is_builtin=True
-        )
+    if name in BUILTIN_ROLE_INFOS:
+        return BUILTIN_ROLE_INFOS[name]
     
     # 检查自定义角色
     row = db.query(RoleTemplate).filter(RoleTemplate.name == name).first()
@@ -1,8 +1,10 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from ..core.db import get_db
+from ..core.response import ORJSONResponse
 from ..core.security import get_current_user_jwt
 from ..models import User
 from ..models.scene import SceneSession
@@ -12,7 +14,8 @@ from ..schemas.scene import (
     SceneParticipantCreate, SceneParticipantUpdate, SceneParticipantOut,
     SceneMessageCreate, SceneMessageOut,
     SceneMessageRequest, SceneResponse, SceneStats,
-    SceneSessionDetail, SceneTemplateDetail
+    SceneSessionDetail, SceneTemplateDetail,
+    SCENE_SESSION_LIST_ADAPTER, SCENE_TEMPLATE_LIST_ADAPTER
 )
 from ..services.scene_service import SceneService
 
@@ -40,12 +43,12 @@ async def get_templates(
     total = query.count()
     templates = query.order_by(SceneTemplate.created_at.desc()).offset(offset).limit(size).all()
 
-    return SceneTemplateList(
-        templates=templates,
-        total=total,
-        page=page,
-        size=size
+    # 复用模块级 TypeAdapter 直接序列化为 JSON 字节，跳过 jsonable_encoder
+    payload = SCENE_TEMPLATE_LIST_ADAPTER.validate_python(
+        {"templates": templates, "total": total, "page": page, "size": size},
+        from_attributes=True
     )
+    return Response(content=SCENE_TEMPLATE_LIST_ADAPTER.dump_json(payload), media_type="application/json")
 
 @router.get("/templates/{template_id}", response_model=SceneTemplateDetail)
 async def get_template_detail(template_id: int, db: Session = Depends(get_db)):
@@ -105,12 +108,11 @@ async def get_user_sessions(
 
     sessions, total = service.get_user_sessions(current_user.id, page, size)
 
-    return SceneSessionList(
-        sessions=sessions,
-        total=total,
-        page=page,
-        size=size
+    payload = SCENE_SESSION_LIST_ADAPTER.validate_python(
+        {"sessions": sessions, "total": total, "page": page, "size": size},
+        from_attributes=True
     )
+    return Response(content=SCENE_SESSION_LIST_ADAPTER.dump_json(payload), media_type="application/json")
 
 @router.get("/sessions/{session_id}", response_model=SceneSessionDetail)
 async def get_session_detail(
@@ -134,11 +136,12 @@ async def get_session_detail(
     # 获取最近的消息
     messages, _ = service.get_session_messages(session_id, 1, 20)
 
-    return SceneSessionDetail(
+    # 直接返回响应对象，跳过 response_model 的二次校验和 jsonable_encoder
+    return ORJSONResponse(SceneSessionDetail(
         **session.__dict__,
         participants=participants,
         messages=messages
-    )
+    ))
 
 @router.put("/sessions/{session_id}", response_model=SceneSessionOut)
 async def update_session(
@@ -281,8 +284,9 @@ async def send_scene_message(
     message_data.session_id = session_id
 
     try:
-        response = service.send_message(current_user.id, message_data)
-        return response
+        # 生成角色回复会同步调用LLM，放到线程池执行，不阻塞事件循环
+        response = await run_in_threadpool(service.send_message, current_user.id, message_data)
+        return ORJSONResponse(response)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,11 +1,21 @@
 """schemas package"""
 
+from pydantic import BaseModel
+
 from .user import UserCreate, UserOut
 from .role import (
     RoleCreate, RoleUpdate, RoleOut, RoleList, RoleSearchParams,
-    UserRoleCreate, UserRoleUpdate, UserRoleOut, RoleTemplate
+    UserRoleCreate, UserRoleUpdate, UserRoleOut, RoleTemplate,
+    RoleInfo, RoleTemplateCreate, RoleTemplateUpdate, RoleTemplateOut,
+    ROLE_LIST_ADAPTER
+)
+from .chat import (
+    ChatRequest, ChatResponse, TTSRequest,
+    ChatMessageCreate, ChatMessageResponse,
+    ChatSessionCreate, ChatSessionResponse,
+    ChatHistoryRequest, ChatHistoryResponse, ChatMessageType,
+    CHAT_SESSION_LIST_ADAPTER, CHAT_MESSAGE_LIST_ADAPTER
 )
-from .chat import ChatRequest, ChatResponse
 from .recommendation import (
     RecommendationItem, RecommendationResponse, UserBehaviorProfile,
     RecommendationExplanation, RecommendationAnalytics, RecommendationFeedback
@@ -14,7 +24,8 @@ from .growth import (
     SkillProgress, LevelInfo, FeedbackAnalysis, GrowthHistory, RoleGrowthSummary,
     FeedbackCreate, FeedbackResponse, FeedbackReason, SkillUpdateResponse,
     GrowthStats, UserFeedbackStats, RoleSkillResponse, GrowthLeaderboard,
-    FeedbackReasonOptions
+    FeedbackReasonOptions, FeedbackBase, LikeFeedback, DislikeFeedback, RatingFeedback,
+    FavoriteRole, SKILL_PROGRESS_LIST_ADAPTER
 )
 from .scene import (
     SceneType, SceneStatus, ParticipantType, MessageType,
@@ -26,20 +37,28 @@ from .scene import (
     SceneRecommendationBase, SceneRecommendationCreate, SceneRecommendationOut,
     SceneSessionDetail, SceneTemplateDetail, ParticipantInfo, SceneMessageDetail,
     SceneMessageRequest, SceneResponse, SceneStats, SceneRecommendationResponse,
-    SceneSessionList, SceneTemplateList
+    SceneSessionList, SceneTemplateList,
+    SCENE_SESSION_LIST_ADAPTER, SCENE_TEMPLATE_LIST_ADAPTER
 )
 
 __all__ = [
     "UserCreate", "UserOut",
     "RoleCreate", "RoleUpdate", "RoleOut", "RoleList", "RoleSearchParams",
     "UserRoleCreate", "UserRoleUpdate", "UserRoleOut", "RoleTemplate",
-    "ChatRequest", "ChatResponse",
+    "RoleInfo", "RoleTemplateCreate", "RoleTemplateUpdate", "RoleTemplateOut",
+    "ROLE_LIST_ADAPTER",
+    "ChatRequest", "ChatResponse", "TTSRequest",
+    "ChatMessageCreate", "ChatMessageResponse",
+    "ChatSessionCreate", "ChatSessionResponse",
+    "ChatHistoryRequest", "ChatHistoryResponse", "ChatMessageType",
+    "CHAT_SESSION_LIST_ADAPTER", "CHAT_MESSAGE_LIST_ADAPTER",
     "RecommendationItem", "RecommendationResponse", "UserBehaviorProfile",
     "RecommendationExplanation", "RecommendationAnalytics", "RecommendationFeedback",
     "SkillProgress", "LevelInfo", "FeedbackAnalysis", "GrowthHistory", "RoleGrowthSummary",
     "FeedbackCreate", "FeedbackResponse", "FeedbackReason", "SkillUpdateResponse",
     "GrowthStats", "UserFeedbackStats", "RoleSkillResponse", "GrowthLeaderboard",
-    "FeedbackReasonOptions",
+    "FeedbackReasonOptions", "FeedbackBase", "LikeFeedback", "DislikeFeedback", "RatingFeedback",
+    "FavoriteRole", "SKILL_PROGRESS_LIST_ADAPTER",
     "SceneType", "SceneStatus", "ParticipantType", "MessageType",
     "SceneTemplateBase", "SceneTemplateCreate", "SceneTemplateUpdate", "SceneTemplateOut",
     "SceneSessionBase", "SceneSessionCreate", "SceneSessionUpdate", "SceneSessionOut",
@@ -49,7 +68,17 @@ __all__ = [
     "SceneRecommendationBase", "SceneRecommendationCreate", "SceneRecommendationOut",
     "SceneSessionDetail", "SceneTemplateDetail", "ParticipantInfo", "SceneMessageDetail",
     "SceneMessageRequest", "SceneResponse", "SceneStats", "SceneRecommendationResponse",
-    "SceneSessionList", "SceneTemplateList"
+    "SceneSessionList", "SceneTemplateList",
+    "SCENE_SESSION_LIST_ADAPTER", "SCENE_TEMPLATE_LIST_ADAPTER"
 ]
 
 
+def warm_schemas() -> None:
+    """
+    启动时确保所有导出的 schema 已完成构建
+    含前向引用等无法在定义时构建的模型，pydantic 会推迟到首次校验时才构建，这里提前完成
+    """
+    for name in __all__:
+        obj = globals()[name]
+        if isinstance(obj, type) and issubclass(obj, BaseModel) and not obj.__pydantic_complete__:
+            obj.model_rebuild()
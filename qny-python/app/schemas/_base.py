@@ -0,0 +1,20 @@
+"""
+schemas 公共配置
+"""
+
+from pydantic import ConfigDict
+
+
+# 响应模型通用配置：
+# - from_attributes: 直接从 ORM 对象读取属性
+# - extra='ignore': 忽略多余字段
+# - validate_default=False: 不对默认值重复校验
+# - revalidate_instances='never': 嵌套模型实例直接复用，不再复制/重新校验
+# - frozen: 响应模型构建后只读，不需要赋值校验
+RESPONSE_CONFIG = ConfigDict(
+    from_attributes=True,
+    extra='ignore',
+    validate_default=False,
+    revalidate_instances='never',
+    frozen=True,
+)
@@ -0,0 +1,28 @@
+"""
+schemas 公共类型别名
+"""
+
+from typing import Annotated
+
+from pydantic import Field, StringConstraints
+
+
+# 非负整数（严格模式，不接受 "37" 这类字符串或浮点数）
+NonNegInt = Annotated[int, Field(ge=0, strict=True)]
+# 非负浮点数
+NonNegFloat = Annotated[float, Field(ge=0)]
+# 百分比（0-100）
+Percent = Annotated[float, Field(ge=0, le=100)]
+# 评分（1-5星）
+Rating = Annotated[int, Field(ge=1, le=5)]
+# 短文本（名称、关键词等，去除首尾空白后最多100个字符）
+ShortStr = Annotated[str, StringConstraints(strip_whitespace=True, max_length=100)]
+# 长文本（描述等，去除首尾空白后最多500个字符）
+LongStr = Annotated[str, StringConstraints(strip_whitespace=True, max_length=500)]
+# 用户名（字母、数字、下划线和中文，长度3-50），由 pydantic-core 直接做正则校验
+Username = Annotated[str, StringConstraints(min_length=3, max_length=50, pattern=r'^[a-zA-Z0-9_\u4e00-\u9fa5]+$')]
+# 用户名或邮箱地址（登录时两种都允许）
+UsernameOrEmail = Annotated[str, StringConstraints(
+    min_length=3, max_length=50,
+    pattern=r'^([a-zA-Z0-9_\u4e00-\u9fa5]+|[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})$',
+)]
@@ -1,6 +1,21 @@
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
-from pydantic import BaseModel
+from typing_extensions import TypedDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter, with_config
+
+from ._base import RESPONSE_CONFIG
+
+
+# 聊天消息类型
+ChatMessageType = Literal["text", "image", "audio"]
+
+
+@with_config(ConfigDict(extra='allow'))
+class SessionMeta(TypedDict, total=False):
+    """会话元数据：常用键显式声明，其余键原样保留"""
+    ip: str
+    user_agent: str
+    client: str
 
 
 class ChatRequest(BaseModel):
@@ -25,48 +40,46 @@ class TTSRequest(BaseModel):
 class ChatMessageCreate(BaseModel):
     session_id: str
     role_id: Optional[int] = None
-    message_type: str = "text"
+    message_type: ChatMessageType = "text"
     content: str
     is_user_message: bool
     message_metadata: Optional[dict] = None
 
 
 class ChatMessageResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     id: int
     session_id: str
     role_id: Optional[int]
-    message_type: str
+    message_type: ChatMessageType
     content: str
     is_user_message: bool
     message_metadata: Optional[dict]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class ChatSessionCreate(BaseModel):
     role_id: Optional[int] = None
     title: Optional[str] = None
-    session_metadata: Optional[dict] = None
+    session_metadata: Optional[SessionMeta] = None
 
 
 class ChatSessionResponse(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     id: int
     session_id: str
     user_id: int
     role_id: Optional[int]
     title: Optional[str]
     is_active: bool
-    session_metadata: Optional[dict]
+    session_metadata: Optional[SessionMeta]
     message_count: int
     last_message_at: Optional[datetime]
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 
 class ChatHistoryRequest(BaseModel):
     session_id: Optional[str] = None
@@ -78,4 +91,9 @@ class ChatHistoryRequest(BaseModel):
 class ChatHistoryResponse(BaseModel):
     sessions: List[ChatSessionResponse]
     messages: List[ChatMessageResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+
+# 会话/消息列表校验器，模块加载时构建一次，列表接口直接复用
+CHAT_SESSION_LIST_ADAPTER: TypeAdapter[List[ChatSessionResponse]] = TypeAdapter(List[ChatSessionResponse])
+CHAT_MESSAGE_LIST_ADAPTER: TypeAdapter[List[ChatMessageResponse]] = TypeAdapter(List[ChatMessageResponse])
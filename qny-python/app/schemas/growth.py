@@ -2,36 +2,46 @@
 成长系统相关的数据验证schemas
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Literal, Union, Annotated
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, TypeAdapter
 from datetime import datetime
 
+from ._base import RESPONSE_CONFIG
+from ._types import NonNegInt, NonNegFloat, Percent, Rating
+
 
 class SkillProgress(BaseModel):
     """技能进度信息"""
-    skill_name: str = Field(..., description="技能名称")
-    skill_description: Optional[str] = Field(None, description="技能描述")
-    proficiency_level: int = Field(..., ge=0, le=100, description="熟练度（0-100）")
-    is_unlocked: bool = Field(..., description="是否已解锁")
-    unlock_level: int = Field(..., description="解锁所需等级")
-    usage_count: int = Field(..., ge=0, description="使用次数")
+    model_config = RESPONSE_CONFIG
+
+    skill_name: str
+    skill_description: Optional[str] = None
+    proficiency_level: NonNegInt = Field(..., le=100)
+    is_unlocked: bool
+    unlock_level: StrictInt
+    usage_count: NonNegInt
+
+
+SKILL_PROGRESS_LIST_ADAPTER: TypeAdapter[List[SkillProgress]] = TypeAdapter(List[SkillProgress])
 
 
 class LevelInfo(BaseModel):
     """等级信息"""
-    current_level: int = Field(..., ge=1, description="当前等级")
-    current_exp: int = Field(..., ge=0, description="当前经验值")
-    next_level_exp: int = Field(..., ge=0, description="下一级所需经验值")
-    exp_progress: int = Field(..., ge=0, description="当前等级进度经验值")
-    exp_needed: int = Field(..., ge=0, description="升级所需经验值")
-    progress_percentage: float = Field(..., ge=0, le=100, description="升级进度百分比")
+    model_config = RESPONSE_CONFIG
+
+    current_level: StrictInt = Field(..., ge=1)
+    current_exp: NonNegInt
+    next_level_exp: NonNegInt
+    exp_progress: NonNegInt
+    exp_needed: NonNegInt
+    progress_percentage: Percent
 
 
 class FeedbackAnalysis(BaseModel):
     """反馈分析结果"""
-    total_feedbacks: int = Field(..., ge=0, description="总反馈数量")
-    satisfaction_rate: float = Field(..., ge=0, le=100, description="满意度百分比")
-    feedback_distribution: Dict[str, int] = Field(..., description="反馈类型分布")
+    total_feedbacks: NonNegInt = Field(..., description="总反馈数量")
+    satisfaction_rate: Percent = Field(..., description="满意度百分比")
+    feedback_distribution: Dict[str, NonNegInt] = Field(..., description="反馈类型分布")
     common_reasons: List[str] = Field(..., description="常见反馈原因")
     trend_analysis: str = Field(..., description="趋势分析")
 
@@ -46,34 +56,58 @@ class GrowthHistory(BaseModel):
 
 class RoleGrowthSummary(BaseModel):
     """角色成长摘要"""
-    role_id: int = Field(..., description="角色ID")
-    role_name: str = Field(..., description="角色名称")
-    level: int = Field(..., ge=1, description="角色等级")
-    experience: int = Field(..., ge=0, description="总经验值")
-    next_level_exp: int = Field(..., ge=0, description="下一级所需经验值")
-    exp_progress: int = Field(..., ge=0, description="当前等级进度")
-    exp_needed: int = Field(..., ge=0, description="升级所需经验值")
-    progress_percentage: float = Field(..., ge=0, le=100, description="升级进度百分比")
-    total_conversations: int = Field(..., ge=0, description="总对话次数")
-    positive_feedback: int = Field(..., ge=0, description="好评数量")
-    negative_feedback: int = Field(..., ge=0, description="差评数量")
-    skills: List[SkillProgress] = Field(..., description="技能进度列表")
-    satisfaction_rate: float = Field(..., ge=0, le=100, description="满意度")
-    growth_rate: float = Field(..., ge=0, description="成长率")
+    model_config = RESPONSE_CONFIG
+
+    role_id: StrictInt
+    role_name: str
+    level: StrictInt = Field(..., ge=1)
+    experience: NonNegInt
+    next_level_exp: NonNegInt
+    exp_progress: NonNegInt
+    exp_needed: NonNegInt
+    progress_percentage: Percent
+    total_conversations: NonNegInt
+    positive_feedback: NonNegInt
+    negative_feedback: NonNegInt
+    skills: List[SkillProgress]
+    satisfaction_rate: Percent
+    growth_rate: NonNegFloat
 
 
 # === 请求参数schemas ===
 
-class FeedbackCreate(BaseModel):
-    """创建反馈请求"""
+class FeedbackBase(BaseModel):
+    """反馈请求公共字段"""
     role_id: int = Field(..., description="角色ID")
     message_id: Optional[int] = Field(None, description="消息ID")
-    feedback_type: str = Field(..., description="反馈类型：like/dislike/rating")
-    rating: Optional[int] = Field(None, ge=1, le=5, description="评分（1-5星）")
+    rating: Optional[Rating] = Field(None, description="评分（1-5星）")
     feedback_reason: Optional[str] = Field(None, description="反馈原因")
     comment: Optional[str] = Field(None, description="详细评论")
 
 
+class LikeFeedback(FeedbackBase):
+    """点赞反馈"""
+    feedback_type: Literal['like'] = Field(..., description="反馈类型")
+
+
+class DislikeFeedback(FeedbackBase):
+    """点踩反馈"""
+    feedback_type: Literal['dislike'] = Field(..., description="反馈类型")
+
+
+class RatingFeedback(FeedbackBase):
+    """评分反馈，必须携带评分"""
+    feedback_type: Literal['rating'] = Field(..., description="反馈类型")
+    rating: Rating = Field(..., description="评分（1-5星）")
+
+
+# 创建反馈请求：按 feedback_type 标签直接分派到对应模型
+FeedbackCreate = Annotated[
+    Union[LikeFeedback, DislikeFeedback, RatingFeedback],
+    Field(discriminator='feedback_type')
+]
+
+
 class FeedbackReason(BaseModel):
     """反馈原因选项"""
     reason: str = Field(..., description="原因文本")
@@ -106,9 +140,9 @@ class SkillUpdateResponse(BaseModel):
 
 class GrowthStats(BaseModel):
     """成长统计数据"""
-    role_id: int = Field(..., description="角色ID")
-    total_conversations: int = Field(..., description="总对话次数")
-    total_feedbacks: int = Field(..., description="总反馈数")
+    role_id: StrictInt = Field(..., description="角色ID")
+    total_conversations: NonNegInt = Field(..., description="总对话次数")
+    total_feedbacks: NonNegInt = Field(..., description="总反馈数")
     satisfaction_rate: float = Field(..., description="满意度")
     growth_rate: float = Field(..., description="成长率")
     level_progress: LevelInfo = Field(..., description="等级进度")
@@ -116,38 +150,52 @@ class GrowthStats(BaseModel):
     recent_activities: List[GrowthHistory] = Field(..., description="最近活动")
 
 
+class FavoriteRole(BaseModel):
+    """用户最喜欢的角色"""
+    model_config = ConfigDict(extra='ignore')
+
+    role_id: int = Field(..., description="角色ID")
+    name: str = Field(..., description="角色名称")
+    score: int = Field(..., description="反馈得分")
+    count: int = Field(..., description="反馈次数")
+
+
 class UserFeedbackStats(BaseModel):
     """用户反馈统计"""
     total_given: int = Field(..., description="给出的反馈总数")
     satisfaction_rate: float = Field(..., description="个人满意度")
-    favorite_roles: List[Dict[str, Any]] = Field(..., description="最喜欢的角色")
+    favorite_roles: List[FavoriteRole] = Field(..., description="最喜欢的角色")
     feedback_trend: str = Field(..., description="反馈趋势")
 
 
 class RoleSkillResponse(BaseModel):
     """角色技能响应"""
-    id: int = Field(..., description="技能ID")
-    role_id: int = Field(..., description="角色ID")
-    skill_name: str = Field(..., description="技能名称")
-    skill_description: Optional[str] = Field(None, description="技能描述")
-    skill_category: Optional[str] = Field(None, description="技能分类")
-    proficiency_level: int = Field(..., ge=0, le=100, description="熟练度")
-    is_unlocked: bool = Field(..., description="是否已解锁")
-    unlock_level: int = Field(..., description="解锁等级")
-    usage_count: int = Field(..., ge=0, description="使用次数")
-    skill_metadata: Optional[Dict[str, Any]] = Field(None, description="技能元数据")
-    created_at: datetime = Field(..., description="创建时间")
+    model_config = RESPONSE_CONFIG
+
+    id: int
+    role_id: int
+    skill_name: str
+    skill_description: Optional[str] = None
+    skill_category: Optional[str] = None
+    proficiency_level: NonNegInt = Field(..., le=100)
+    is_unlocked: bool
+    unlock_level: int
+    usage_count: NonNegInt
+    skill_metadata: Optional[dict] = None
+    created_at: datetime
 
 
 class GrowthLeaderboard(BaseModel):
     """成长排行榜"""
-    role_id: int = Field(..., description="角色ID")
-    role_name: str = Field(..., description="角色名称")
-    level: int = Field(..., description="等级")
-    experience: int = Field(..., description="经验值")
-    total_conversations: int = Field(..., description="总对话数")
-    satisfaction_rate: float = Field(..., description="满意度")
-    rank: int = Field(..., description="排名")
+    model_config = RESPONSE_CONFIG
+
+    role_id: StrictInt
+    role_name: str
+    level: StrictInt
+    experience: NonNegInt
+    total_conversations: NonNegInt
+    satisfaction_rate: float
+    rank: StrictInt
 
 
 class FeedbackReasonOptions(BaseModel):
@@ -2,14 +2,17 @@
 推荐系统相关的数据验证schema
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 
 from .role import RoleOut
+from ._base import RESPONSE_CONFIG
 
 
 class RecommendationItem(BaseModel):
     """推荐项"""
+    model_config = RESPONSE_CONFIG
+
     role: RoleOut
     score: float = Field(..., description="推荐分数", ge=0.0, le=1.0)
     reason: str = Field(..., description="推荐原因")
@@ -29,9 +32,9 @@ class UserBehaviorProfile(BaseModel):
     total_sessions: int = Field(..., description="总会话数")
     total_messages: int = Field(..., description="总消息数")
     activity_level: int = Field(..., description="活跃天数")
-    favorite_categories: List[tuple] = Field(..., description="喜爱的分类")
-    favorite_tags: List[tuple] = Field(..., description="喜爱的标签")
-    most_used_roles: List[tuple] = Field(..., description="最常用的角色")
+    favorite_categories: List[Tuple[str, int]] = Field(..., description="喜爱的分类")
+    favorite_tags: List[Tuple[str, int]] = Field(..., description="喜爱的标签")
+    most_used_roles: List[Tuple[int, int]] = Field(..., description="最常用的角色")
 
 
 class RecommendationExplanation(BaseModel):
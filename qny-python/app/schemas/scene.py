@@ -1,8 +1,10 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from enum import Enum
 
+from ._base import RESPONSE_CONFIG
+
 # 枚举定义
 class SceneType(str, Enum):
     DISCUSSION = "discussion"
@@ -48,14 +50,13 @@ class SceneTemplateUpdate(BaseModel):
     is_active: Optional[bool] = Field(None, description="是否启用")
 
 class SceneTemplateOut(SceneTemplateBase):
+    model_config = RESPONSE_CONFIG
+
     id: int
     is_active: bool
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # 场景会话相关
 class SceneSessionBase(BaseModel):
     name: str = Field(..., description="会话名称")
@@ -74,6 +75,8 @@ class SceneSessionUpdate(BaseModel):
     config: Optional[Dict[str, Any]] = Field(None, description="会话配置")
 
 class SceneSessionOut(SceneSessionBase):
+    model_config = RESPONSE_CONFIG
+
     id: int
     session_id: str
     user_id: int
@@ -84,9 +87,6 @@ class SceneSessionOut(SceneSessionBase):
     updated_at: datetime
     ended_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 # 场景参与者相关
 class SceneParticipantBase(BaseModel):
     session_id: int = Field(..., description="会话ID")
@@ -106,15 +106,14 @@ class SceneParticipantUpdate(BaseModel):
     personality_config: Optional[Dict[str, Any]] = Field(None, description="个性化配置")
 
 class SceneParticipantOut(SceneParticipantBase):
+    model_config = RESPONSE_CONFIG
+
     id: int
     is_active: bool
     speak_count: int
     last_speak_at: Optional[datetime]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # 场景消息相关
 class SceneMessageBase(BaseModel):
     session_id: int = Field(..., description="会话ID")
@@ -129,13 +128,12 @@ class SceneMessageCreate(SceneMessageBase):
     pass
 
 class SceneMessageOut(SceneMessageBase):
+    model_config = RESPONSE_CONFIG
+
     id: int
     message_order: Optional[int]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # 场景互动规则相关
 class SceneInteractionRuleBase(BaseModel):
     template_id: int = Field(..., description="模板ID")
@@ -159,13 +157,12 @@ class SceneInteractionRuleUpdate(BaseModel):
     description: Optional[str] = Field(None, description="规则描述")
 
 class SceneInteractionRuleOut(SceneInteractionRuleBase):
+    model_config = RESPONSE_CONFIG
+
     id: int
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # 场景推荐相关
 class SceneRecommendationBase(BaseModel):
     template_id: int = Field(..., description="模板ID")
@@ -176,15 +173,14 @@ class SceneRecommendationCreate(SceneRecommendationBase):
     pass
 
 class SceneRecommendationOut(SceneRecommendationBase):
+    model_config = RESPONSE_CONFIG
+
     id: int
     user_id: int
     is_clicked: bool
     is_used: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # 复杂输出结构
 class SceneSessionDetail(SceneSessionOut):
     template: SceneTemplateOut
@@ -243,4 +239,9 @@ class SceneTemplateList(BaseModel):
     templates: List[SceneTemplateOut]
     total: int
     page: int
-    size: int
\ No newline at end of file
+    size: int
+
+
+# 分页列表的校验/序列化器，模块加载时构建一次，列表接口直接复用
+SCENE_SESSION_LIST_ADAPTER: TypeAdapter[SceneSessionList] = TypeAdapter(SceneSessionList)
+SCENE_TEMPLATE_LIST_ADAPTER: TypeAdapter[SceneTemplateList] = TypeAdapter(SceneTemplateList)
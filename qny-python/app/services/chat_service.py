@@ -1,13 +1,20 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
+from sqlalchemy import func, insert, update
 from sqlalchemy.orm import Session
 
 from ..models.chat import ChatSession, ChatMessage
+from ..models.role import Role
 from ..schemas.chat import ChatSessionCreate, ChatMessageCreate, ChatHistoryRequest
 from ..core.security import get_current_user
 
 
+# 角色名称很少变化，进程内缓存 role_id -> name，创建会话时无需每次查询
+_ROLE_NAMES_MAX = 1024
+_role_names: Dict[int, str] = {}
+
+
 class ChatService:
     def __init__(self, db: Session):
         self.db = db
@@ -20,21 +27,19 @@ class ChatService:
             # 如果没有提供标题，使用角色名称或默认标题
             title = session_data.title
             if not title and session_data.role_id:
-                from ..models.role import Role
-                role = self.db.query(Role).filter(Role.id == session_data.role_id).first()
-                if role:
-                    title = f"与{role.name}的对话"
-
-            if not title:
-                title = f"新对话 {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                role_name = self._get_role_name(session_data.role_id)
+                if role_name:
+                    title = f"与{role_name}的对话"
 
             db_session = ChatSession(
                 session_id=session_id,
                 user_id=user_id,
                 role_id=session_data.role_id,
-                title=title,
                 session_metadata=session_data.session_metadata or {}
             )
+            # 仍没有标题时不赋值，由列默认值生成 "新对话 <时间>"
+            if title:
+                db_session.title = title
 
             self.db.add(db_session)
             self.db.commit()
@@ -44,6 +49,17 @@ class ChatService:
             self.db.rollback()
             raise e
 
+    def _get_role_name(self, role_id: int) -> Optional[str]:
+        """获取角色名称，只查询 name 列并缓存结果"""
+        name = _role_names.get(role_id)
+        if name is None:
+            name = self.db.query(Role.name).filter(Role.id == role_id).scalar()
+            if name is not None:
+                if len(_role_names) >= _ROLE_NAMES_MAX:
+                    _role_names.clear()
+                _role_names[role_id] = name
+        return name
+
     def get_session(self, session_id: str, user_id: int) -> Optional[ChatSession]:
         """获取聊天会话"""
         return self.db.query(ChatSession).filter(
@@ -62,31 +78,46 @@ class ChatService:
 
     def save_message(self, message_data: ChatMessageCreate, user_id: int) -> ChatMessage:
         """保存聊天消息"""
-        # 验证会话是否存在且属于该用户
-        session = self.get_session(message_data.session_id, user_id)
-        if not session:
-            raise ValueError("会话不存在或无权限访问")
-
-        db_message = ChatMessage(
-            session_id=message_data.session_id,
-            user_id=user_id,
-            role_id=message_data.role_id,
-            message_type=message_data.message_type,
-            content=message_data.content,
-            is_user_message=message_data.is_user_message,
-            message_metadata=message_data.message_metadata or {}
-        )
-
-        self.db.add(db_message)
-
-        # 更新会话信息
-        session.message_count += 1
-        session.last_message_at = datetime.utcnow()
-        session.updated_at = datetime.utcnow()
+        try:
+            # 更新会话信息：计数在数据库端自增，避免并发写入相互覆盖；
+            # 条件中带上 user_id，同时完成会话归属校验
+            result = self.db.execute(
+                update(ChatSession)
+                .where(ChatSession.session_id == message_data.session_id, ChatSession.user_id == user_id)
+                .values(
+                    message_count=ChatSession.message_count + 1,
+                    last_message_at=func.now(),
+                    updated_at=func.now()
+                )
+            )
+            if result.rowcount == 0:
+                raise ValueError("会话不存在或无权限访问")
 
-        self.db.commit()
-        self.db.refresh(db_message)
-        return db_message
+            values = dict(
+                session_id=message_data.session_id,
+                user_id=user_id,
+                role_id=message_data.role_id,
+                message_type=message_data.message_type,
+                content=message_data.content,
+                is_user_message=message_data.is_user_message,
+                message_metadata=message_data.message_metadata or {}
+            )
+            if self.db.get_bind().dialect.insert_returning:
+                # INSERT ... RETURNING 直接拿到含服务端默认值的消息，无需再 refresh
+                db_message = self.db.execute(
+                    insert(ChatMessage).values(**values).returning(ChatMessage)
+                ).scalar_one()
+                self.db.commit()
+            else:
+                # MySQL 不支持 RETURNING，插入后再 refresh
+                db_message = ChatMessage(**values)
+                self.db.add(db_message)
+                self.db.commit()
+                self.db.refresh(db_message)
+            return db_message
+        except Exception:
+            self.db.rollback()
+            raise
 
     def get_session_messages(self, session_id: str, user_id: int, limit: int = 100, offset: int = 0) -> List[ChatMessage]:
         """获取会话的消息列表"""
@@ -103,6 +134,14 @@ class ChatService:
             ChatMessage.session_id == session_id
         ).order_by(ChatMessage.created_at.asc()).offset(offset).limit(limit).all()
 
+    def get_recent_messages(self, session_id: str, limit: int) -> List[ChatMessage]:
+        """按时间顺序返回会话最近的 limit 条消息（调用方需已校验会话权限）"""
+        messages = self.db.query(ChatMessage).filter(
+            ChatMessage.session_id == session_id
+        ).order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit).all()
+        messages.reverse()
+        return messages
+
     def get_chat_history(self, user_id: int, request: ChatHistoryRequest) -> dict:
         """获取聊天历史"""
         sessions = []
@@ -119,8 +158,22 @@ class ChatService:
                     ChatMessage.session_id == request.session_id
                 ).count()
         else:
-            # 获取用户的会话列表
-            sessions = self.get_user_sessions(user_id, request.role_id, request.limit, request.offset)
+            # 获取用户的会话列表，总数通过窗口函数随同一次查询返回
+            query = self.db.query(ChatSession, func.count().over().label("total")).filter(
+                ChatSession.user_id == user_id
+            )
+            if request.role_id:
+                query = query.filter(ChatSession.role_id == request.role_id)
+            rows = query.order_by(ChatSession.updated_at.desc()).offset(request.offset).limit(request.limit).all()
+            sessions = [row[0] for row in rows]
+            if rows:
+                total = rows[0].total
+            elif request.offset:
+                # 偏移量超出范围时拿不到窗口计数，单独统计
+                count_query = self.db.query(ChatSession).filter(ChatSession.user_id == user_id)
+                if request.role_id:
+                    count_query = count_query.filter(ChatSession.role_id == request.role_id)
+                total = count_query.count()
 
             # 获取最近的消息用于预览
             if sessions:
@@ -136,15 +189,6 @@ class ChatService:
                 # 反转顺序，让最新的消息在后面
                 messages = list(reversed(messages))
 
-            # 计算总数
-            if request.role_id:
-                total = self.db.query(ChatSession).filter(
-                    ChatSession.user_id == user_id,
-                    ChatSession.role_id == request.role_id
-                ).count()
-            else:
-                total = self.db.query(ChatSession).filter(ChatSession.user_id == user_id).count()
-
         return {
             "sessions": sessions,
             "messages": messages,
@@ -1,32 +1,104 @@
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 import json
 
 import io
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from PyPDF2 import PdfReader
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    reader = PdfReader(io.BytesIO(file_bytes))
+# 文本处理用的正则在模块加载时编译一次
+_CODE_FENCE_RE = re.compile(r"```[\s\S]*?```")
+_INLINE_CODE_RE = re.compile(r"`[^`]*`")
+_HEADING_RE = re.compile(r"^#+ ", flags=re.M)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[。！？.!?])\s+")
+
+
+# PDF 按页并行提取文本时的最大线程数，以及每个任务处理的连续页数
+_PDF_WORKERS = 4
+_PDF_PAGES_PER_TASK = 8
+
+
+def _extract_pages(reader: PdfReader, pages: range) -> List[str]:
     texts = []
-    for page in reader.pages:
+    for i in pages:
         try:
-            texts.append(page.extract_text() or "")
+            texts.append(reader.pages[i].extract_text() or "")
         except Exception:
             continue
-    return "\n".join(texts)
+    return texts
+
+
+def iter_text_from_pdf(file_bytes: bytes) -> Iterator[str]:
+    """
+    按页顺序逐页产出 PDF 文本，不拼接整份文档
+    """
+    reader = PdfReader(io.BytesIO(file_bytes))
+    page_count = len(reader.pages)
+    workers = min(_PDF_WORKERS, -(-page_count // _PDF_PAGES_PER_TASK))
+    if workers <= 1:
+        yield from _extract_pages(reader, range(page_count))
+        return
+
+    # PdfReader 按需从底层流 seek/read，不能跨线程共享，
+    # 每个线程基于同一份字节懒创建自己的 reader 并复用
+    local = threading.local()
+
+    def extract(pages: range) -> List[str]:
+        if not hasattr(local, "reader"):
+            local.reader = PdfReader(io.BytesIO(file_bytes))
+        return _extract_pages(local.reader, pages)
+
+    ranges = [range(i, min(i + _PDF_PAGES_PER_TASK, page_count)) for i in range(0, page_count, _PDF_PAGES_PER_TASK)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 每轮只提交 workers 个任务，已提取但未消费的文本不超过 workers 个任务的量
+        for i in range(0, len(ranges), workers):
+            for part in executor.map(extract, ranges[i:i + workers]):
+                yield from part
+
+
+def extract_text_from_pdf(file_bytes: bytes) -> str:
+    return "\n".join(iter_text_from_pdf(file_bytes))
 
 
 def extract_text_from_markdown(file_bytes: bytes) -> str:
     # 简化：直接当作 utf-8 文本处理，剔除部分 markdown 标记
     text = file_bytes.decode("utf-8", errors="ignore")
-    text = re.sub(r"```[\s\S]*?```", " ", text)
-    text = re.sub(r"`[^`]*`", " ", text)
-    text = re.sub(r"^#+ ", " ", text, flags=re.M)
+    text = _CODE_FENCE_RE.sub(" ", text)
+    text = _INLINE_CODE_RE.sub(" ", text)
+    text = _HEADING_RE.sub(" ", text)
     return text
 
 
+def _flatten_json(data) -> List[str]:
+    """
+    用显式栈遍历 JSON，把叶子节点展开成 "路径: 值" 行，按文档顺序输出
+    """
+    out: List[str] = []
+    stack = [("", data)]
+    while stack:
+        path, obj = stack.pop()
+        if isinstance(obj, dict):
+            # 逆序入栈，保证出栈顺序与文档顺序一致
+            stack.extend((f"{path}.{key}" if path else key, value) for key, value in reversed(obj.items()))
+        elif isinstance(obj, list):
+            stack.extend((f"{path}[{i}]", obj[i]) for i in range(len(obj) - 1, -1, -1))
+        elif isinstance(obj, str):
+            # 字符串值，包含路径信息
+            if obj.strip():
+                out.append(f"{path}: {obj}")
+        elif obj is None:
+            # null值，包含路径信息
+            out.append(f"{path}: null")
+        else:
+            # 数值、布尔值，包含路径信息
+            out.append(f"{path}: {obj}")
+    return out
+
+
 def extract_text_from_json(file_bytes: bytes) -> str:
     """
     从JSON文件中提取文本内容
@@ -38,50 +110,21 @@ def extract_text_from_json(file_bytes: bytes) -> str:
         str: 提取的文本内容
     """
     try:
-        # 解码JSON文件
-        json_text = file_bytes.decode("utf-8", errors="ignore")
-        data = json.loads(json_text)
-        
-        # 递归提取文本内容
-        def extract_text_recursive(obj, path=""):
-            texts = []
-            
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    texts.extend(extract_text_recursive(value, current_path))
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    current_path = f"{path}[{i}]" if path else f"[{i}]"
-                    texts.extend(extract_text_recursive(item, current_path))
-            elif isinstance(obj, str):
-                # 字符串值，包含路径信息
-                if obj.strip():
-                    texts.append(f"{path}: {obj}")
-            elif isinstance(obj, (int, float)):
-                # 数值，包含路径信息
-                texts.append(f"{path}: {obj}")
-            elif isinstance(obj, bool):
-                # 布尔值，包含路径信息
-                texts.append(f"{path}: {obj}")
-            elif obj is None:
-                # null值，包含路径信息
-                texts.append(f"{path}: null")
-            
-            return texts
-        
-        # 提取所有文本内容
-        extracted_texts = extract_text_recursive(data)
-        
-        # 合并文本，添加换行
-        result = "\n".join(extracted_texts)
-        
+        try:
+            data = orjson.loads(file_bytes)
+        except orjson.JSONDecodeError:
+            # orjson 要求严格的 UTF-8，编码有问题时按原逻辑忽略非法字节后再解析
+            data = json.loads(file_bytes.decode("utf-8", errors="ignore"))
+
+        # 提取所有文本内容并合并，添加换行
+        result = "\n".join(_flatten_json(data))
+
         # 如果提取的文本为空，返回原始JSON字符串
         if not result.strip():
-            return json_text
-        
+            return file_bytes.decode("utf-8", errors="ignore")
+
         return result
-        
+
     except json.JSONDecodeError:
         # JSON解析失败，返回原始文本
         return file_bytes.decode("utf-8", errors="ignore")
@@ -90,25 +133,53 @@ def extract_text_from_json(file_bytes: bytes) -> str:
         return file_bytes.decode("utf-8", errors="ignore")
 
 
-def chunk_text(text: str, max_len: int = 600) -> List[str]:
-    # 简单按句子切分，再合并到接近 max_len
-    sentences = re.split(r"(?<=[。！？.!?])\s+", text)
+def _scan_chunks(text: str, max_len: int) -> Tuple[List[str], int, int]:
+    """
+    按句子边界扫描，返回已确定的块、当前块起点、当前块内最后一个句子边界
+    """
     chunks: List[str] = []
-    buf = []
-    cur = 0
-    for s in sentences:
-        s = s.strip()
-        if not s:
-            continue
-        if cur + len(s) > max_len and buf:
-            chunks.append("".join(buf))
-            buf = [s]
-            cur = len(s)
-        else:
-            buf.append(s)
-            cur += len(s)
-    if buf:
-        chunks.append("".join(buf))
-    return chunks
+    start = 0  # 当前块起点
+    last = 0   # 当前块内最后一个句子边界（下一句的起点）
+    for m in _SENTENCE_SPLIT_RE.finditer(text):
+        if m.start() - start > max_len and last > start:
+            chunks.append(text[start:last])
+            start = last
+        last = m.end()
+    return chunks, start, last
+
+
+def chunk_text(text: str, max_len: int = 600) -> List[str]:
+    if len(text) <= max_len:
+        # 整段不超过 max_len 时一定只有一块，无需扫描句子边界
+        text = text.strip()
+        return [text] if text else []
 
+    # 按句子边界单次扫描，把相邻句子合并到接近 max_len 后直接切片，不再逐句 strip/join
+    chunks, start, last = _scan_chunks(text, max_len)
+    if len(text) - start > max_len and last > start:
+        chunks.append(text[start:last])
+        start = last
+    chunks.append(text[start:])
+    return [c for c in (c.strip() for c in chunks) if c]
 
+
+def iter_chunks(texts: Iterable[str], max_len: int = 600) -> Iterator[str]:
+    """
+    对逐段产出的文本（如逐页的 PDF 文本）做流式切块，各段之间以换行连接，
+    结果与对拼接后的全文调用 chunk_text 相同，但只保留尚未切出的尾部
+    """
+    buf = ""
+    first = True
+    for piece in texts:
+        # 第一段之后每段前都加换行（包括空段，如扫描版 PDF 的空白页），与 "\n".join 一致
+        buf = piece if first else f"{buf}\n{piece}"
+        first = False
+        if len(buf) <= max_len:
+            continue
+        done, start, _ = _scan_chunks(buf, max_len)
+        for chunk in done:
+            chunk = chunk.strip()
+            if chunk:
+                yield chunk
+        buf = buf[start:]
+    yield from chunk_text(buf, max_len)
@@ -3,17 +3,103 @@
 实现角色成长算法、经验值计算、等级提升等核心逻辑
 """
 
+import bisect
 import math
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+import time
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, List, Dict, Mapping, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import func, desc, case, insert, update
 
-from ..models import Role, UserFeedback, RoleSkill, ChatMessage, ChatSession
+from ..models import Role, UserRole, UserFeedback, RoleSkill, ChatMessage, ChatSession
 from ..schemas.growth import (
     GrowthStats, SkillProgress, LevelInfo, FeedbackAnalysis,
-    GrowthHistory, RoleGrowthSummary
+    GrowthHistory, RoleGrowthSummary, SKILL_PROGRESS_LIST_ADAPTER
+)
+from . import leaderboard_cache
+
+
+# 等级门槛表：下标 k 为升到 k+1 级所需的总经验值 k*k*100，
+# 表内的经验值用二分查找换算等级，超出表的部分回退到整数平方根
+_LEVEL_THRESHOLDS: Tuple[int, ...] = tuple(k * k * 100 for k in range(1000))
+
+# 反馈经验值表，键为 (反馈类型, 评分)，非评分反馈的评分固定为 None：
+# 点赞+20，点踩-10；评分1-2星扣分，3星不加不减，4-5星加分
+_FEEDBACK_EXP: Dict[Tuple[str, Optional[int]], int] = {
+    ('like', None): 20,
+    ('dislike', None): -10,
+    ('rating', None): 0,
+    ('rating', 1): -15,
+    ('rating', 2): -15,
+    ('rating', 3): 0,
+    ('rating', 4): 25,
+    ('rating', 5): 30,
+}
+
+# 单条反馈的满意度得分（SQL 表达式）：点赞计5分，点踩计1分，评分计评分值
+FEEDBACK_SCORE = case(
+    (UserFeedback.feedback_type == 'like', 5),
+    (UserFeedback.feedback_type == 'dislike', 1),
+    else_=func.coalesce(UserFeedback.rating, 0)
+)
+
+SkillTemplate = Mapping[str, Any]
+
+
+def _frozen(*skills: dict) -> Tuple[SkillTemplate, ...]:
+    """把技能模板冻结为只读视图，模板在所有调用方之间共享，不允许被修改"""
+    return tuple(MappingProxyType(skill) for skill in skills)
+
+
+# 按角色名称预设的技能模板，只读，在模块加载时构建一次
+_SKILL_TEMPLATES: Mapping[str, Tuple[SkillTemplate, ...]] = MappingProxyType({
+    '哈利波特': _frozen(
+        {'name': '魔法知识', 'description': '掌握丰富的魔法世界知识', 'category': '专业知识', 'unlock_level': 1},
+        {'name': '咒语施放', 'description': '能够施放各种魔法咒语', 'category': '实践技能', 'unlock_level': 1},
+        {'name': '魁地奇飞行', 'description': '精通魁地奇飞行技巧', 'category': '运动技能', 'unlock_level': 3},
+        {'name': '黑魔法防御', 'description': '具备强大的黑魔法防御能力', 'category': '战斗技能', 'unlock_level': 5},
+        {'name': '草药学', 'description': '了解各种魔法植物的特性', 'category': '专业知识', 'unlock_level': 7}
+    ),
+    '苏格拉底': _frozen(
+        {'name': '辩证思维', 'description': '运用苏格拉底式提问法', 'category': '思维技能', 'unlock_level': 1},
+        {'name': '哲学知识', 'description': '掌握古希腊哲学思想', 'category': '专业知识', 'unlock_level': 1},
+        {'name': '逻辑推理', 'description': '强大的逻辑分析能力', 'category': '思维技能', 'unlock_level': 3},
+        {'name': '教育方法', 'description': '独特的启发式教学方法', 'category': '教学技能', 'unlock_level': 5},
+        {'name': '伦理思考', 'description': '深入的伦理道德思考能力', 'category': '思维技能', 'unlock_level': 7}
+    ),
+    '心理咨询师': _frozen(
+        {'name': '情感理解', 'description': '深刻理解他人情感', 'category': '沟通技能', 'unlock_level': 1},
+        {'name': '心理分析', 'description': '专业的心理分析能力', 'category': '专业技能', 'unlock_level': 1},
+        {'name': '倾听技巧', 'description': '优秀的倾听和共情能力', 'category': '沟通技能', 'unlock_level': 3},
+        {'name': '危机干预', 'description': '处理心理危机的能力', 'category': '专业技能', 'unlock_level': 5},
+        {'name': '治疗方案', 'description': '制定个性化治疗方案', 'category': '专业技能', 'unlock_level': 7}
+    ),
+    'Python编程助手': _frozen(
+        {'name': 'Python语法', 'description': '精通Python语法规范', 'category': '编程技能', 'unlock_level': 1},
+        {'name': '算法设计', 'description': '能够设计高效算法', 'category': '编程技能', 'unlock_level': 1},
+        {'name': '调试技巧', 'description': '快速定位和修复bug', 'category': '调试技能', 'unlock_level': 3},
+        {'name': '性能优化', 'description': '代码性能优化能力', 'category': '优化技能', 'unlock_level': 5},
+        {'name': '架构设计', 'description': '软件架构设计能力', 'category': '设计技能', 'unlock_level': 7}
+    ),
+    '前端开发顾问': _frozen(
+        {'name': 'HTML/CSS', 'description': '精通前端标记和样式', 'category': '前端技能', 'unlock_level': 1},
+        {'name': 'JavaScript', 'description': '熟练掌握JavaScript', 'category': '编程技能', 'unlock_level': 1},
+        {'name': '框架应用', 'description': '熟练使用主流前端框架', 'category': '框架技能', 'unlock_level': 3},
+        {'name': '响应式设计', 'description': '响应式网页设计能力', 'category': '设计技能', 'unlock_level': 5},
+        {'name': '性能优化', 'description': '前端性能优化技巧', 'category': '优化技能', 'unlock_level': 7}
+    )
+})
+
+# 默认技能模板
+_DEFAULT_SKILLS: Tuple[SkillTemplate, ...] = _frozen(
+    {'name': '知识储备', 'description': '丰富的专业知识', 'category': '专业技能', 'unlock_level': 1},
+    {'name': '沟通表达', 'description': '清晰的沟通表达能力', 'category': '沟通技能', 'unlock_level': 1},
+    {'name': '逻辑思维', 'description': '强大的逻辑思维能力', 'category': '思维技能', 'unlock_level': 3},
+    {'name': '学习适应', 'description': '快速学习和适应能力', 'category': '学习能力', 'unlock_level': 5},
+    {'name': '创新思维', 'description': '创新和创造性思维', 'category': '思维技能', 'unlock_level': 7}
 )
 
 
@@ -33,66 +119,74 @@ class GrowthService:
         """
         根据用户反馈计算经验值
         """
-        exp_map = {
-            'like': 20,
-            'dislike': -10,
-            'rating': 0  # 评分单独计算
-        }
-
-        base_exp = exp_map.get(feedback_type, 0)
-
-        if feedback_type == 'rating' and rating:
-            # 评分经验值：1-2星扣分，3星不加不减，4-5星加分
-            if rating <= 2:
-                base_exp = -15
-            elif rating >= 4:
-                base_exp = 25 + (rating - 4) * 5
-
-        return base_exp
+        return _FEEDBACK_EXP.get((feedback_type, rating if feedback_type == 'rating' else None), 0)
 
     def calculate_level(self, total_exp: int) -> int:
         """
         根据总经验值计算等级
         等级公式：level = floor(sqrt(total_exp / 100)) + 1
+        查等级门槛表或用整数平方根计算，与浮点公式等价且不受舍入误差影响
         """
-        return math.floor(math.sqrt(total_exp / 100)) + 1
+        total_exp = max(0, total_exp)
+        if total_exp < _LEVEL_THRESHOLDS[-1]:
+            return bisect.bisect_right(_LEVEL_THRESHOLDS, total_exp)
+        return math.isqrt(total_exp // 100) + 1
 
     def calculate_experience_for_next_level(self, current_level: int) -> int:
         """
         计算升级到下一级所需经验值
         """
-        return (current_level ** 2) * 100
+        if 0 <= current_level < len(_LEVEL_THRESHOLDS):
+            return _LEVEL_THRESHOLDS[current_level]
+        return current_level * current_level * 100
 
     def update_role_experience(self, role_id: int, exp_change: int, reason: str = "") -> bool:
         """
         更新角色经验值和等级
         """
+        # 经验值不变且没有需要统计的原因时，不会有任何修改，直接返回
+        if exp_change == 0 and not reason:
+            return True
+
         try:
-            role = self.db.query(Role).filter(Role.id == role_id).first()
+            role = self.db.get(Role, role_id)
             if not role:
                 return False
 
-            old_level = role.level
-            old_exp = role.experience
+            self._apply_experience(role, exp_change, reason)
 
-            # 更新经验值
-            role.experience = max(0, role.experience + exp_change)
+            self.db.commit()
 
-            # 计算新等级
-            role.level = self.calculate_level(role.experience)
+            # 提交后同步排行榜
+            leaderboard_cache.sync_role(role)
+            return True
 
-            # 记录成长历史
-            if old_level != role.level:
-                self._record_growth_history(
-                    role_id, 'level_up',
-                    f"等级从 {old_level} 提升到 {role.level}",
-                    {'old_level': old_level, 'new_level': role.level}
-                )
+        except Exception as e:
+            self.db.rollback()
+            return False
+
+    def bulk_update_experience(self, changes: List[Tuple[int, int, str]]) -> bool:
+        """
+        批量更新多个角色的经验值和等级
+        changes 为 (role_id, exp_change, reason) 列表，用于批量奖励、定期衰减等后台任务；
+        一次查询加载全部角色，在同一个事务中提交，排行榜也只同步一次
+        """
+        if not changes:
+            return True
+
+        try:
+            role_ids = {role_id for role_id, _, _ in changes}
+            roles = {role.id: role for role in self.db.query(Role).filter(Role.id.in_(role_ids))}
 
-            # 更新成长统计
-            self._update_growth_stats(role, exp_change, reason)
+            for role_id, exp_change, reason in changes:
+                role = roles.get(role_id)
+                if role:
+                    self._apply_experience(role, exp_change, reason)
 
             self.db.commit()
+
+            # 提交后同步排行榜
+            leaderboard_cache.sync_roles(roles.values())
             return True
 
         except Exception as e:
@@ -108,22 +202,24 @@ class GrowthService:
             exp_gain = self.calculate_experience_for_conversation()
 
             # 更新角色数据
-            role = self.db.query(Role).filter(Role.id == role_id).first()
+            role = self.db.get(Role, role_id)
             if role:
-                role.total_conversations += 1
-                self.update_role_experience(role_id, exp_gain, "conversation")
-
-            # 更新用户角色使用次数
-            from ..models import UserRole
-            user_role = self.db.query(UserRole).filter(
-                UserRole.user_id == user_id,
-                UserRole.role_id == role_id
-            ).first()
-            if user_role:
-                user_role.usage_count += 1
-                user_role.last_used_at = datetime.utcnow()
+                # 对话计数在数据库端自增，避免并发对话相互覆盖
+                role.total_conversations = Role.total_conversations + 1
+                self._apply_experience(role, exp_gain, "conversation")
+
+            # 更新用户角色使用次数，同样在数据库端自增，不再先查询
+            self.db.execute(
+                update(UserRole)
+                .where(UserRole.user_id == user_id, UserRole.role_id == role_id)
+                .values(usage_count=UserRole.usage_count + 1, last_used_at=datetime.utcnow())
+            )
 
             self.db.commit()
+
+            # 提交后同步排行榜
+            if role:
+                leaderboard_cache.sync_role(role)
             return True
 
         except Exception as e:
@@ -141,30 +237,33 @@ class GrowthService:
             # 计算经验值变化
             exp_change = self.calculate_experience_for_feedback(feedback_type, rating)
 
-            # 创建反馈记录
-            feedback = UserFeedback(
-                user_id=user_id,
-                role_id=role_id,
-                message_id=message_id,
-                feedback_type=feedback_type,
-                rating=rating,
-                feedback_reason=feedback_reason,
-                comment=comment
-            )
-            self.db.add(feedback)
+            # 创建反馈记录：直接 INSERT，不创建 ORM 对象
+            self.db.execute(insert(UserFeedback), {
+                'user_id': user_id,
+                'role_id': role_id,
+                'message_id': message_id,
+                'feedback_type': feedback_type,
+                'rating': rating,
+                'feedback_reason': feedback_reason,
+                'comment': comment
+            })
 
-            # 更新角色反馈统计
-            role = self.db.query(Role).filter(Role.id == role_id).first()
+            # 更新角色反馈统计，计数在数据库端自增
+            role = self.db.get(Role, role_id)
             if role:
                 if feedback_type == 'like' or (rating and rating >= 4):
-                    role.positive_feedback += 1
+                    role.positive_feedback = Role.positive_feedback + 1
                 elif feedback_type == 'dislike' or (rating and rating <= 2):
-                    role.negative_feedback += 1
+                    role.negative_feedback = Role.negative_feedback + 1
 
                 # 更新经验值
-                self.update_role_experience(role_id, exp_change, f"feedback_{feedback_type}")
+                self._apply_experience(role, exp_change, f"feedback_{feedback_type}")
 
             self.db.commit()
+
+            # 提交后同步排行榜
+            if role:
+                leaderboard_cache.sync_role(role)
             return True
 
         except Exception as e:
@@ -175,32 +274,31 @@ class GrowthService:
         """
         获取角色成长摘要
         """
-        role = self.db.query(Role).filter(Role.id == role_id).first()
+        role = self.db.get(Role, role_id)
         if not role:
             return None
 
         # 计算下一级所需经验值
         next_level_exp = self.calculate_experience_for_next_level(role.level)
-        current_level_exp = ((role.level - 1) ** 2) * 100
+        current_level_exp = self.calculate_experience_for_next_level(role.level - 1)
         exp_progress = role.experience - current_level_exp
         exp_needed = next_level_exp - current_level_exp
         progress_percentage = (exp_progress / exp_needed * 100) if exp_needed > 0 else 0
 
-        # 获取技能数据
-        skills = self.db.query(RoleSkill).filter(
+        # 获取技能数据：只查询 SkillProgress 需要的列，返回轻量的 Row 而不是 ORM 对象，
+        # 再一次性交给 SKILL_PROGRESS_LIST_ADAPTER 校验
+        skills = self.db.query(
+            RoleSkill.skill_name,
+            RoleSkill.skill_description,
+            RoleSkill.proficiency_level,
+            RoleSkill.is_unlocked,
+            RoleSkill.unlock_level,
+            RoleSkill.usage_count
+        ).filter(
             RoleSkill.role_id == role_id
         ).order_by(desc(RoleSkill.proficiency_level)).all()
 
-        skill_progress = []
-        for skill in skills:
-            skill_progress.append(SkillProgress(
-                skill_name=skill.skill_name,
-                skill_description=skill.skill_description,
-                proficiency_level=skill.proficiency_level,
-                is_unlocked=skill.is_unlocked,
-                unlock_level=skill.unlock_level,
-                usage_count=skill.usage_count
-            ))
+        skill_progress = SKILL_PROGRESS_LIST_ADAPTER.validate_python(skills, from_attributes=True)
 
         return RoleGrowthSummary(
             role_id=role.id,
@@ -223,14 +321,16 @@ class GrowthService:
         """
         获取用户反馈分析
         """
-        query = self.db.query(UserFeedback).filter(UserFeedback.user_id == user_id)
-
+        filters = [UserFeedback.user_id == user_id]
         if role_id:
-            query = query.filter(UserFeedback.role_id == role_id)
+            filters.append(UserFeedback.role_id == role_id)
 
-        feedbacks = query.all()
+        # 按反馈类型分组，在数据库中完成计数和满意度得分累加
+        rows = self.db.query(
+            UserFeedback.feedback_type, func.count(), func.sum(FEEDBACK_SCORE)
+        ).filter(*filters).group_by(UserFeedback.feedback_type).all()
 
-        total_feedbacks = len(feedbacks)
+        total_feedbacks = sum(count for _, count, _ in rows)
         if total_feedbacks == 0:
             return FeedbackAnalysis(
                 total_feedbacks=0,
@@ -244,27 +344,20 @@ class GrowthService:
         feedback_distribution = {'like': 0, 'dislike': 0, 'rating': 0}
         satisfaction_score = 0
 
-        for feedback in feedbacks:
-            feedback_distribution[feedback.feedback_type] += 1
-
-            if feedback.feedback_type == 'like':
-                satisfaction_score += 5
-            elif feedback.feedback_type == 'dislike':
-                satisfaction_score += 1
-            elif feedback.rating:
-                satisfaction_score += feedback.rating
+        for feedback_type, count, type_score in rows:
+            feedback_distribution[feedback_type] = int(count)
+            satisfaction_score += int(type_score or 0)
 
         # 计算满意度
         satisfaction_rate = (satisfaction_score / (total_feedbacks * 5)) * 100
 
         # 分析常见原因
-        reason_counts = {}
-        for feedback in feedbacks:
-            if feedback.feedback_reason:
-                reason_counts[feedback.feedback_reason] = reason_counts.get(feedback.feedback_reason, 0) + 1
-
-        common_reasons = sorted(reason_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        common_reasons = [reason for reason, count in common_reasons]
+        reason_rows = self.db.query(UserFeedback.feedback_reason).filter(
+            *filters,
+            UserFeedback.feedback_reason.isnot(None),
+            UserFeedback.feedback_reason != ''
+        ).group_by(UserFeedback.feedback_reason).order_by(desc(func.count())).limit(5).all()
+        common_reasons = [reason for reason, in reason_rows]
 
         # 趋势分析（简化版）
         trend_analysis = "反馈趋势稳定" if satisfaction_rate > 70 else "需要改进用户体验"
@@ -285,18 +378,20 @@ class GrowthService:
             # 根据角色名称预设技能
             skill_templates = self._get_skill_templates_for_role(role_name)
 
-            for i, skill_template in enumerate(skill_templates):
-                skill = RoleSkill(
-                    role_id=role_id,
-                    skill_name=skill_template['name'],
-                    skill_description=skill_template['description'],
-                    skill_category=skill_template['category'],
-                    proficiency_level=0,
-                    is_unlocked=i < 2,  # 前两个技能默认解锁
-                    unlock_level=skill_template.get('unlock_level', 1),
-                    skill_metadata=skill_template.get('metadata', {})
-                )
-                self.db.add(skill)
+            # 一条 executemany INSERT 写入全部技能，不逐个创建 ORM 对象
+            self.db.execute(insert(RoleSkill), [
+                {
+                    'role_id': role_id,
+                    'skill_name': skill_template['name'],
+                    'skill_description': skill_template['description'],
+                    'skill_category': skill_template['category'],
+                    'proficiency_level': 0,
+                    'is_unlocked': i < 2,  # 前两个技能默认解锁
+                    'unlock_level': skill_template.get('unlock_level', 1),
+                    'skill_metadata': skill_template.get('metadata', {})
+                }
+                for i, skill_template in enumerate(skill_templates)
+            ])
 
             self.db.commit()
             return True
@@ -329,7 +424,9 @@ class GrowthService:
             skill.proficiency_level = new_proficiency
 
             # 检查是否应该解锁新技能
-            self._check_and_unlock_skills(role_id)
+            role = self.db.get(Role, role_id)
+            if role:
+                self._check_and_unlock_skills(role)
 
             self.db.commit()
             return True
@@ -338,28 +435,57 @@ class GrowthService:
             self.db.rollback()
             return False
 
-    def _record_growth_history(self, role_id: int, event_type: str, description: str, metadata: dict):
+    def _apply_experience(self, role: Role, exp_change: int, reason: str):
+        """在已加载的角色上更新经验值、等级和成长统计，不提交"""
+        # 经验值不变（如3星评分）时等级也不会变，只需更新成长统计
+        if exp_change:
+            old_level = role.level
+
+            # 更新经验值
+            role.experience = max(0, role.experience + exp_change)
+
+            # 计算新等级
+            role.level = self.calculate_level(role.experience)
+
+            # 记录成长历史
+            if old_level != role.level:
+                self._record_growth_history(
+                    role, 'level_up',
+                    f"等级从 {old_level} 提升到 {role.level}",
+                    {'old_level': old_level, 'new_level': role.level}
+                )
+
+        # 更新成长统计
+        self._update_growth_stats(role, exp_change, reason)
+
+    def _record_growth_history(self, role: Role, event_type: str, description: str, metadata: dict):
         """记录成长历史"""
+        self._record_growth_events(role, [(event_type, description, metadata)])
+
+    def _record_growth_events(self, role: Role, events: List[Tuple[str, str, dict]]):
+        """批量记录成长历史，多条事件只修改一次 growth_stats"""
         # 这里可以添加一个GrowthHistory模型来记录历史
         # 目前简化处理，直接更新角色的growth_stats字段
-        role = self.db.query(Role).filter(Role.id == role_id).first()
-        if role and role.growth_stats:
+        if role.growth_stats:
             stats = role.growth_stats
             if 'history' not in stats:
                 stats['history'] = []
 
-            stats['history'].append({
-                'timestamp': datetime.utcnow().isoformat(),
+            # 时间戳存为整数秒（UTC 纪元时间），比 ISO 字符串更紧凑
+            ts = int(time.time())
+            stats['history'].extend({
+                'ts': ts,
                 'event_type': event_type,
                 'description': description,
                 'metadata': metadata
-            })
+            } for event_type, description, metadata in events)
 
             # 保持历史记录在最近100条
             if len(stats['history']) > 100:
-                stats['history'] = stats['history'][-100:]
+                del stats['history'][:-100]
 
-            role.growth_stats = stats
+            # 原地修改的 JSON 不会被自动检测到，显式标记一次即可
+            flag_modified(role, 'growth_stats')
 
     def _update_growth_stats(self, role: Role, exp_change: int, reason: str):
         """更新成长统计数据"""
@@ -381,95 +507,41 @@ class GrowthService:
             stats['reason_stats'][reason] = 0
         stats['reason_stats'][reason] += 1
 
-        # 更新最后更新时间
-        stats['last_updated'] = datetime.utcnow().isoformat()
+        # 更新最后更新时间：对外保持 ISO 字符串格式（UTC）
+        stats['last_updated'] = datetime.now(timezone.utc).isoformat()
 
-        role.growth_stats = stats
+        flag_modified(role, 'growth_stats')
 
     def _calculate_satisfaction_rate(self, role: Role) -> float:
         """计算角色满意度"""
-        total_feedbacks = role.positive_feedback + role.negative_feedback
-        if total_feedbacks == 0:
-            return 75.0  # 默认满意度
-
-        return (role.positive_feedback / total_feedbacks) * 100
+        return role.satisfaction_rate
 
     def _calculate_growth_rate(self, role: Role) -> float:
         """计算成长率"""
-        if role.total_conversations == 0:
-            return 0.0
-
-        # 简单的成长率计算：经验值 / 对话次数
-        return role.experience / max(role.total_conversations, 1)
+        return role.growth_rate
 
-    def _check_and_unlock_skills(self, role_id: int):
+    def _check_and_unlock_skills(self, role: Role):
         """检查并解锁新技能"""
-        role = self.db.query(Role).filter(Role.id == role_id).first()
-        if not role:
-            return
-
-        # 查找未解锁的技能
-        locked_skills = self.db.query(RoleSkill).filter(
-            RoleSkill.role_id == role_id,
-            RoleSkill.is_unlocked == False
+        # 只查出已达到解锁等级的未解锁技能，且只取需要的列
+        unlockable = self.db.query(RoleSkill.id, RoleSkill.skill_name, RoleSkill.unlock_level).filter(
+            RoleSkill.role_id == role.id,
+            RoleSkill.is_unlocked == False,
+            RoleSkill.unlock_level <= role.level
         ).all()
+        if not unlockable:
+            return
 
-        for skill in locked_skills:
-            if role.level >= skill.unlock_level:
-                skill.is_unlocked = True
-                self._record_growth_history(
-                    role_id, 'skill_unlock',
-                    f"解锁技能：{skill.skill_name}",
-                    {'skill_name': skill.skill_name, 'unlock_level': skill.unlock_level}
-                )
+        # 一条 UPDATE 完成解锁（MySQL 不支持 UPDATE ... RETURNING，按上面查出的 id 更新）
+        self.db.execute(
+            update(RoleSkill)
+            .where(RoleSkill.id.in_([skill_id for skill_id, _, _ in unlockable]))
+            .values(is_unlocked=True)
+        )
+        self._record_growth_events(role, [
+            ('skill_unlock', f"解锁技能：{skill_name}", {'skill_name': skill_name, 'unlock_level': unlock_level})
+            for _, skill_name, unlock_level in unlockable
+        ])
 
-    def _get_skill_templates_for_role(self, role_name: str) -> List[dict]:
+    def _get_skill_templates_for_role(self, role_name: str) -> Tuple[SkillTemplate, ...]:
         """根据角色名称获取技能模板"""
-        templates = {
-            '哈利波特': [
-                {'name': '魔法知识', 'description': '掌握丰富的魔法世界知识', 'category': '专业知识', 'unlock_level': 1},
-                {'name': '咒语施放', 'description': '能够施放各种魔法咒语', 'category': '实践技能', 'unlock_level': 1},
-                {'name': '魁地奇飞行', 'description': '精通魁地奇飞行技巧', 'category': '运动技能', 'unlock_level': 3},
-                {'name': '黑魔法防御', 'description': '具备强大的黑魔法防御能力', 'category': '战斗技能', 'unlock_level': 5},
-                {'name': '草药学', 'description': '了解各种魔法植物的特性', 'category': '专业知识', 'unlock_level': 7}
-            ],
-            '苏格拉底': [
-                {'name': '辩证思维', 'description': '运用苏格拉底式提问法', 'category': '思维技能', 'unlock_level': 1},
-                {'name': '哲学知识', 'description': '掌握古希腊哲学思想', 'category': '专业知识', 'unlock_level': 1},
-                {'name': '逻辑推理', 'description': '强大的逻辑分析能力', 'category': '思维技能', 'unlock_level': 3},
-                {'name': '教育方法', 'description': '独特的启发式教学方法', 'category': '教学技能', 'unlock_level': 5},
-                {'name': '伦理思考', 'description': '深入的伦理道德思考能力', 'category': '思维技能', 'unlock_level': 7}
-            ],
-            '心理咨询师': [
-                {'name': '情感理解', 'description': '深刻理解他人情感', 'category': '沟通技能', 'unlock_level': 1},
-                {'name': '心理分析', 'description': '专业的心理分析能力', 'category': '专业技能', 'unlock_level': 1},
-                {'name': '倾听技巧', 'description': '优秀的倾听和共情能力', 'category': '沟通技能', 'unlock_level': 3},
-                {'name': '危机干预', 'description': '处理心理危机的能力', 'category': '专业技能', 'unlock_level': 5},
-                {'name': '治疗方案', 'description': '制定个性化治疗方案', 'category': '专业技能', 'unlock_level': 7}
-            ],
-            'Python编程助手': [
-                {'name': 'Python语法', 'description': '精通Python语法规范', 'category': '编程技能', 'unlock_level': 1},
-                {'name': '算法设计', 'description': '能够设计高效算法', 'category': '编程技能', 'unlock_level': 1},
-                {'name': '调试技巧', 'description': '快速定位和修复bug', 'category': '调试技能', 'unlock_level': 3},
-                {'name': '性能优化', 'description': '代码性能优化能力', 'category': '优化技能', 'unlock_level': 5},
-                {'name': '架构设计', 'description': '软件架构设计能力', 'category': '设计技能', 'unlock_level': 7}
-            ],
-            '前端开发顾问': [
-                {'name': 'HTML/CSS', 'description': '精通前端标记和样式', 'category': '前端技能', 'unlock_level': 1},
-                {'name': 'JavaScript', 'description': '熟练掌握JavaScript', 'category': '编程技能', 'unlock_level': 1},
-                {'name': '框架应用', 'description': '熟练使用主流前端框架', 'category': '框架技能', 'unlock_level': 3},
-                {'name': '响应式设计', 'description': '响应式网页设计能力', 'category': '设计技能', 'unlock_level': 5},
-                {'name': '性能优化', 'description': '前端性能优化技巧', 'category': '优化技能', 'unlock_level': 7}
-            ]
-        }
-
-        # 默认技能模板
-        default_skills = [
-            {'name': '知识储备', 'description': '丰富的专业知识', 'category': '专业技能', 'unlock_level': 1},
-            {'name': '沟通表达', 'description': '清晰的沟通表达能力', 'category': '沟通技能', 'unlock_level': 1},
-            {'name': '逻辑思维', 'description': '强大的逻辑思维能力', 'category': '思维技能', 'unlock_level': 3},
-            {'name': '学习适应', 'description': '快速学习和适应能力', 'category': '学习能力', 'unlock_level': 5},
-            {'name': '创新思维', 'description': '创新和创造性思维', 'category': '思维技能', 'unlock_level': 7}
-        ]
-
-        return templates.get(role_name, default_skills)
\ No newline at end of file
+        return _SKILL_TEMPLATES.get(role_name, _DEFAULT_SKILLS)
\ No newline at end of file
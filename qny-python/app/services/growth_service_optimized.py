@@ -5,23 +5,56 @@
 - 改进成长机制
 """
 
-import math
+import bisect
 import json
-import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Set
+from types import MappingProxyType
+from typing import Any, List, Dict, Optional, Tuple, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import func, desc, and_, or_, insert, update, case, select, true
 from dataclasses import dataclass
 from enum import Enum
-from functools import lru_cache
 
+import numpy as np
+import orjson
+import redis
+
+from ..core.config import settings
 from ..models import Role, UserFeedback, RoleSkill, ChatMessage, ChatSession
 from ..schemas.growth import (
     GrowthStats, SkillProgress, LevelInfo, FeedbackAnalysis,
     GrowthHistory, RoleGrowthSummary
 )
 from ..utils.helpers import retry_on_failure
+from ..utils.logger import get_logger
+from . import leaderboard_cache
+
+
+logger = get_logger(__name__)
+
+# 成长摘要缓存放在 Redis 中，各 worker 共享，角色经验变化时统一失效
+_redis = redis.Redis.from_url(settings.redis_url, decode_responses=False)
+
+
+# 技能熟练度升级所需的累计使用次数，第 k 个阈值对应熟练度 k
+_PROFICIENCY_THRESHOLDS = (5, 15, 30, 50, 75, 100, 150, 200, 300, 500)
+
+
+# 技能 ID 到名称的映射，模块加载时构建一次，只读
+_SKILL_NAMES = MappingProxyType({
+    1: "魔法知识",
+    2: "咒语施放",
+    3: "魁地奇飞行",
+    4: "黑魔法防御",
+    5: "草药学"
+})
+
+
+def _summary_key(role_id: int) -> str:
+    return f"growth_summary:{role_id}"
 
 
 class GrowthEventType(Enum):
@@ -63,31 +96,33 @@ class OptimizedGrowthService:
                 5: [5],     # 5级解锁技能5
             }
 
-        self._exp_cache = {}
-        self._level_cache = {}
-        self._cache_lock = threading.Lock()
+        # 等级阈值表：_thresholds[k] 为达到 k+1 级所需的总经验值 k² * BASE
+        self._thresholds = np.arange(self.config.MAX_LEVEL + 1, dtype=np.int64) ** 2 * self.config.LEVEL_FORMULA_BASE
+
+        # batched() 期间暂存的经验更新，None 表示未处于批量模式
+        self._pending: Optional[List[Tuple[int, int, GrowthEventType, Optional[Dict]]]] = None
 
-    @lru_cache(maxsize=1000)
     def calculate_level(self, total_exp: int) -> int:
         """
-        根据总经验值计算等级（缓存优化）
-        使用更平滑的等级公式：level = floor(sqrt(total_exp / BASE))
+        根据总经验值计算等级（查表）
+        使用更平滑的等级公式：level = floor(sqrt(total_exp / BASE)) + 1
         """
-        if total_exp < 0:
-            return 1
+        level = int(np.searchsorted(self._thresholds, total_exp, side='right'))
+        return min(max(level, 1), self.config.MAX_LEVEL)
 
-        level = math.floor(math.sqrt(total_exp / self.config.LEVEL_FORMULA_BASE)) + 1
-        return min(level, self.config.MAX_LEVEL)
+    def calculate_level_batch(self, total_exps) -> np.ndarray:
+        """批量计算等级，供排行榜、成长趋势等一次重算多个角色"""
+        levels = np.searchsorted(self._thresholds, np.asarray(total_exps), side='right')
+        return np.clip(levels, 1, self.config.MAX_LEVEL)
 
-    @lru_cache(maxsize=1000)
     def calculate_experience_for_next_level(self, current_level: int) -> int:
         """
-        计算升级到下一级所需经验值（缓存优化）
+        计算升级到下一级所需经验值（查表）
         """
         if current_level >= self.config.MAX_LEVEL:
             return 0
 
-        return (current_level ** 2) * self.config.LEVEL_FORMULA_BASE
+        return int(self._thresholds[max(current_level, 0)])
 
     def calculate_experience_for_conversation(self, message_count: int = 1, session_duration: Optional[float] = None) -> int:
         """
@@ -147,55 +182,123 @@ class OptimizedGrowthService:
     def update_role_experience(self, role_id: int, exp_change: int, event_type: GrowthEventType, metadata: Optional[Dict] = None) -> bool:
         """
         更新角色经验值和等级（优化版）
+        处于 batched() 中时只暂存，退出时统一写入
+        采用乐观并发控制：读取时不加锁，写入时以读到的经验值作为版本条件，
+        期间被其他请求修改过则抛出 StaleDataError，由重试装饰器重新读取后再试
         """
-        try:
-            with self._cache_lock:
-                # 清除相关缓存
-                self._clear_role_cache(role_id)
+        if self._pending is not None:
+            self._pending.append((role_id, exp_change, event_type, metadata))
+            return True
 
-            # 使用批量更新和事务处理
-            role = self.db.query(Role).filter(Role.id == role_id).with_for_update().first()
+        try:
+            role = self.db.query(Role).filter(Role.id == role_id).populate_existing().first()
             if not role:
                 return False
 
-            old_level = role.level
             old_exp = role.experience
+            self._apply_experience(role, exp_change, event_type, metadata)
+
+            # 条件更新：只有经验值仍是读取时的值才写入，行锁只在这条语句到提交之间持有
+            result = self.db.execute(
+                update(Role)
+                .where(Role.id == role_id, Role.experience == old_exp)
+                .values(experience=role.experience, level=role.level)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                raise StaleDataError(f"角色 {role_id} 的经验值已被并发修改")
 
-            # 更新经验值（确保不为负数）
-            new_exp = max(0, role.experience + exp_change)
-            role.experience = new_exp
+            # 经验值和等级已由上面的语句写入，提交时不再重复更新
+            set_committed_value(role, 'experience', role.experience)
+            set_committed_value(role, 'level', role.level)
+            self.db.commit()
 
-            # 计算新等级
-            new_level = self.calculate_level(new_exp)
-            role.level = new_level
+            # 提交后再清除缓存，避免并发读取把旧数据重新写回
+            self._clear_role_cache(role_id)
+            return True
 
-            # 检查是否升级
-            level_up = old_level != new_level
-            if level_up:
-                self._handle_level_up(role, old_level, new_level)
+        except Exception as e:
+            self.db.rollback()
+            raise e
 
-            # 记录成长历史
-            self._record_growth_history_optimized(role_id, event_type, exp_change, metadata)
+    @retry_on_failure(max_attempts=3, delay=0.5)
+    def bulk_update_experience(self, changes: List[Tuple[int, int, GrowthEventType, Optional[Dict]]]) -> bool:
+        """
+        批量更新角色经验值和等级
+        changes 为 (role_id, exp_change, event_type, metadata) 列表，
+        一次查询锁定涉及的全部角色，按原顺序逐条应用后只提交一次
+        """
+        if not changes:
+            return True
 
-            # 更新成长统计
-            self._update_growth_stats_optimized(role, exp_change, event_type)
+        try:
+            role_ids = {change[0] for change in changes}
+            roles = {
+                role.id: role
+                for role in self.db.query(Role).filter(Role.id.in_(role_ids)).with_for_update()
+            }
+
+            for role_id, exp_change, event_type, metadata in changes:
+                role = roles.get(role_id)
+                if role:
+                    self._apply_experience(role, exp_change, event_type, metadata)
 
             self.db.commit()
+
+            if roles:
+                self._clear_role_cache(*roles)
             return True
 
         except Exception as e:
             self.db.rollback()
             raise e
 
-    def _clear_role_cache(self, role_id: int):
-        """清除角色相关缓存"""
-        cache_keys_to_clear = []
-        for key in list(self._exp_cache.keys()):
-            if isinstance(key, tuple) and key[0] == role_id:
-                cache_keys_to_clear.append(key)
+    @contextmanager
+    def batched(self):
+        """
+        批量模式：with 块内的经验更新先暂存，正常退出时合并为一次批量更新；
+        块内抛出异常时丢弃暂存的更新。嵌套使用时由最外层统一写入
+        """
+        if self._pending is not None:
+            yield self
+            return
+
+        self._pending = []
+        try:
+            yield self
+            pending = self._pending
+        finally:
+            self._pending = None
+        self.bulk_update_experience(pending)
+
+    def _apply_experience(self, role: Role, exp_change: int, event_type: GrowthEventType, metadata: Optional[Dict] = None):
+        """在已加载的角色上应用一次经验变化，不提交"""
+        old_level = role.level
+
+        # 更新经验值（确保不为负数）
+        new_exp = max(0, role.experience + exp_change)
+        role.experience = new_exp
 
-        for key in cache_keys_to_clear:
-            self._exp_cache.pop(key, None)
+        # 计算新等级
+        new_level = self.calculate_level(new_exp)
+        role.level = new_level
+
+        # 检查是否升级
+        if old_level != new_level:
+            self._handle_level_up(role, old_level, new_level)
+
+        # 记录成长历史
+        self._record_growth_history_optimized(role.id, event_type, exp_change, metadata)
+
+        # 更新成长统计
+        self._update_growth_stats_optimized(role, exp_change, event_type)
+
+    def _clear_role_cache(self, *role_ids: int):
+        """清除角色相关缓存，失败时忽略"""
+        try:
+            _redis.delete(*(_summary_key(role_id) for role_id in role_ids))
+        except redis.RedisError as e:
+            logger.warning(f"清除成长摘要缓存失败: {e}")
 
     def _handle_level_up(self, role: Role, old_level: int, new_level: int):
         """处理角色升级"""
@@ -216,30 +319,31 @@ class OptimizedGrowthService:
 
     def _unlock_skills_for_level(self, role_id: int, level: int) -> List[int]:
         """为指定等级解锁技能"""
-        unlocked_skills = []
-
-        for unlock_level, skill_ids in self.config.SKILL_UNLOCK_LEVELS.items():
-            if level == unlock_level:
-                for skill_id in skill_ids:
-                    # 检查技能是否已解锁
-                    existing_skill = self.db.query(RoleSkill).filter(
-                        and_(
-                            RoleSkill.role_id == role_id,
-                            RoleSkill.skill_id == skill_id
-                        )
-                    ).first()
-
-                    if not existing_skill:
-                        # 创建新技能
-                        new_skill = RoleSkill(
-                            role_id=role_id,
-                            skill_id=skill_id,
-                            proficiency_level=1,
-                            is_unlocked=True,
-                            unlocked_at=datetime.now()
-                        )
-                        self.db.add(new_skill)
-                        unlocked_skills.append(skill_id)
+        candidate_ids = self.config.SKILL_UNLOCK_LEVELS.get(level, [])
+        if not candidate_ids:
+            return []
+
+        # 一次查询找出已存在的技能，再一次批量插入缺失的技能
+        existing = {
+            skill_id for skill_id, in self.db.query(RoleSkill.skill_id).filter(
+                RoleSkill.role_id == role_id,
+                RoleSkill.skill_id.in_(candidate_ids)
+            )
+        }
+        unlocked_skills = [skill_id for skill_id in candidate_ids if skill_id not in existing]
+
+        if unlocked_skills:
+            now = datetime.now()
+            self.db.execute(insert(RoleSkill), [
+                {
+                    'role_id': role_id,
+                    'skill_id': skill_id,
+                    'proficiency_level': 1,
+                    'is_unlocked': True,
+                    'unlocked_at': now
+                }
+                for skill_id in unlocked_skills
+            ])
 
         return unlocked_skills
 
@@ -264,47 +368,54 @@ class OptimizedGrowthService:
         """
         获取角色成长摘要（优化版）
         """
-        # 检查缓存
-        cache_key = f"growth_summary_{role_id}"
-        with self._cache_lock:
-            if cache_key in self._exp_cache:
-                cache_time, data = self._exp_cache[cache_key]
-                if datetime.now() - cache_time < timedelta(minutes=self.config.EXP_CACHE_EXPIRE_MINUTES):
-                    return data
-
-        role = self.db.query(Role).filter(Role.id == role_id).first()
-        if not role:
+        # 检查缓存，Redis 不可用时视为未命中
+        cache_key = _summary_key(role_id)
+        try:
+            cached = _redis.get(cache_key)
+        except redis.RedisError as e:
+            logger.warning(f"读取成长摘要缓存失败: {e}")
+            cached = None
+        if cached is not None:
+            return orjson.loads(cached)
+
+        # 角色基本信息与反馈统计在同一条查询中取回
+        feedback = self._feedback_stats_subquery(role_id)
+        row = self.db.query(
+            Role.name, Role.level, Role.experience, feedback
+        ).join(feedback, true()).filter(Role.id == role_id).first()
+        if not row:
             return {}
 
-        # 并行获取各项数据
-        current_level = role.level
-        current_exp = role.experience
+        current_level = row.level
+        current_exp = row.experience
         next_level_exp = self.calculate_experience_for_next_level(current_level)
         level_progress = self._calculate_level_progress(current_exp, current_level)
 
         # 获取技能信息
         skills = self._get_role_skills_optimized(role_id)
 
-        # 获取反馈统计
-        feedback_stats = self._get_feedback_stats_optimized(role_id)
+        # 反馈统计
+        feedback_stats = self._build_feedback_stats(row)
 
         summary = {
             "role_id": role_id,
-            "role_name": role.name,
+            "role_name": row.name,
             "current_level": current_level,
             "current_experience": current_exp,
             "next_level_experience": next_level_exp,
             "level_progress": level_progress,
             "total_skills": len(skills),
-            "unlocked_skills": len([s for s in skills if s.is_unlocked]),
+            "unlocked_skills": sum(1 for s in skills if s["is_unlocked"]),
             "skills": skills,
             "feedback_stats": feedback_stats,
             "growth_trend": self._calculate_growth_trend(role_id)
         }
 
         # 缓存结果
-        with self._cache_lock:
-            self._exp_cache[cache_key] = (datetime.now(), summary)
+        try:
+            _redis.set(cache_key, orjson.dumps(summary), ex=self.config.EXP_CACHE_EXPIRE_MINUTES * 60)
+        except redis.RedisError as e:
+            logger.warning(f"写入成长摘要缓存失败: {e}")
 
         return summary
 
@@ -313,8 +424,8 @@ class OptimizedGrowthService:
         if current_level >= self.config.MAX_LEVEL:
             return 100.0
 
-        current_level_exp = (current_level - 1) ** 2 * self.config.LEVEL_FORMULA_BASE
-        next_level_exp = current_level ** 2 * self.config.LEVEL_FORMULA_BASE
+        current_level_exp = int(self._thresholds[current_level - 1])
+        next_level_exp = int(self._thresholds[current_level])
 
         if next_level_exp == current_level_exp:
             return 100.0
@@ -333,7 +444,7 @@ class OptimizedGrowthService:
 
             skill_list.append({
                 "skill_id": skill.skill_id,
-                "skill_name": self._get_skill_name(skill.skill_id),
+                "skill_name": _SKILL_NAMES.get(skill.skill_id, f"技能{skill.skill_id}"),
                 "proficiency_level": skill.proficiency_level,
                 "proficiency_progress": proficiency_progress,
                 "is_unlocked": skill.is_unlocked,
@@ -348,52 +459,30 @@ class OptimizedGrowthService:
         max_proficiency = 10
         return min((proficiency_level / max_proficiency) * 100, 100.0)
 
-    def _get_skill_name(self, skill_id: int) -> str:
-        """获取技能名称"""
-        skill_names = {
-            1: "魔法知识",
-            2: "咒语施放",
-            3: "魁地奇飞行",
-            4: "黑魔法防御",
-            5: "草药学"
-        }
-        return skill_names.get(skill_id, f"技能{skill_id}")
-
-    def _get_feedback_stats_optimized(self, role_id: int) -> Dict[str, Any]:
-        """获取反馈统计（优化版）"""
-        feedback_stats = self.db.query(
-            UserFeedback.feedback_type,
-            func.count(UserFeedback.id).label('count'),
-            func.avg(UserFeedback.rating).label('avg_rating')
-        ).filter(
-            UserFeedback.role_id == role_id
-        ).group_by(UserFeedback.feedback_type).all()
-
+    def _feedback_stats_subquery(self, role_id: int):
+        """角色反馈统计的单行聚合子查询，按反馈类型条件计数"""
+        feedback_type = UserFeedback.feedback_type
+        return select(
+            func.count(UserFeedback.id).label('total_feedback'),
+            func.count(case((feedback_type == 'like', 1))).label('likes'),
+            func.count(case((feedback_type == 'dislike', 1))).label('dislikes'),
+            func.count(case((feedback_type == 'rating', 1))).label('ratings'),
+            func.avg(case((feedback_type == 'rating', UserFeedback.rating))).label('avg_rating')
+        ).where(UserFeedback.role_id == role_id).subquery()
+
+    def _build_feedback_stats(self, stat) -> Dict[str, Any]:
+        """由聚合结果构造反馈统计"""
         result = {
-            "total_feedback": 0,
-            "likes": 0,
-            "dislikes": 0,
+            "total_feedback": stat.total_feedback,
+            "likes": stat.likes,
+            "dislikes": stat.dislikes,
             "ratings": 0,
             "average_rating": 0.0
         }
 
-        total_rating_sum = 0
-        rating_count = 0
-
-        for stat in feedback_stats:
-            result["total_feedback"] += stat.count
-
-            if stat.feedback_type == 'like':
-                result["likes"] = stat.count
-            elif stat.feedback_type == 'dislike':
-                result["dislikes"] = stat.count
-            elif stat.feedback_type == 'rating' and stat.avg_rating:
-                rating_count += stat.count
-                total_rating_sum += stat.avg_rating * stat.count
-
-        if rating_count > 0:
-            result["ratings"] = rating_count
-            result["average_rating"] = total_rating_sum / rating_count
+        if stat.avg_rating:
+            result["ratings"] = stat.ratings
+            result["average_rating"] = float(stat.avg_rating)
 
         # 计算满意度
         total_interactions = result["likes"] + result["dislikes"] + result["ratings"]
@@ -438,40 +527,62 @@ class OptimizedGrowthService:
     def get_leaderboard(self, limit: int = 10, period: str = "all_time") -> List[Dict[str, Any]]:
         """
         获取排行榜（优化版）
+        优先读取 Redis 中的排行榜快照；未命中时查询数据库，并把前 SNAPSHOT_SIZE 名写回快照
         """
         if period == "weekly":
             start_date = datetime.now() - timedelta(days=7)
         elif period == "monthly":
             start_date = datetime.now() - timedelta(days=30)
         else:
+            period = "all_time"
             start_date = None
 
-        # 构建查询
+        snapshot_limit = max(limit, leaderboard_cache.SNAPSHOT_SIZE)
+        if limit <= leaderboard_cache.SNAPSHOT_SIZE:
+            cached = leaderboard_cache.get_snapshot(period, limit)
+            if cached is not None:
+                return cached
+
+        # 会话与反馈分别按角色预聚合后再与角色表连接，
+        # 避免两张明细表同时外连接导致行数相乘、计数失真
+        sessions = select(
+            ChatSession.role_id,
+            func.count(ChatSession.id).label('session_count')
+        ).group_by(ChatSession.role_id)
+        if start_date:
+            sessions = sessions.where(ChatSession.created_at >= start_date)
+        sessions = sessions.subquery()
+
+        feedback = select(
+            UserFeedback.role_id,
+            func.count(UserFeedback.id).label('feedback_count'),
+            func.avg(UserFeedback.rating).label('avg_rating')
+        ).group_by(UserFeedback.role_id).subquery()
+
+        session_count = func.coalesce(sessions.c.session_count, 0).label('session_count')
         query = self.db.query(
             Role.id,
             Role.name,
             Role.level,
             Role.experience,
-            func.count(ChatSession.id).label('session_count'),
-            func.count(UserFeedback.id).label('feedback_count'),
-            func.avg(UserFeedback.rating).label('avg_rating')
+            session_count,
+            func.coalesce(feedback.c.feedback_count, 0).label('feedback_count'),
+            feedback.c.avg_rating
         ).join(
-            ChatSession, Role.id == ChatSession.role_id, isouter=True
+            # 限定统计周期时只保留周期内有会话的角色
+            sessions, Role.id == sessions.c.role_id, isouter=not start_date
         ).join(
-            UserFeedback, Role.id == UserFeedback.role_id, isouter=True
+            feedback, Role.id == feedback.c.role_id, isouter=True
         ).filter(
             Role.is_active == True
         )
 
-        if start_date:
-            query = query.filter(ChatSession.created_at >= start_date)
-
-        # 分组并排序
-        leaderboard_data = query.group_by(Role.id, Role.name, Role.level, Role.experience).order_by(
+        # 排序
+        leaderboard_data = query.order_by(
             desc(Role.level),
             desc(Role.experience),
-            desc('session_count')
-        ).limit(limit).all()
+            desc(session_count)
+        ).limit(snapshot_limit).all()
 
         leaderboard = []
         for rank, data in enumerate(leaderboard_data, 1):
@@ -490,7 +601,8 @@ class OptimizedGrowthService:
                 "score": round(score, 2)
             })
 
-        return leaderboard
+        leaderboard_cache.save_snapshot(period, leaderboard[:leaderboard_cache.SNAPSHOT_SIZE])
+        return leaderboard[:limit]
 
     def _calculate_leaderboard_score(self, data) -> float:
         """计算排行榜分数"""
@@ -498,7 +610,7 @@ class OptimizedGrowthService:
         level_score = data.level * 100
         exp_score = data.experience * 0.1
         activity_score = (data.session_count or 0) * 5
-        rating_score = (float(data.avg_rating) or 0.0) * 20
+        rating_score = float(data.avg_rating or 0.0) * 20
 
         return level_score + exp_score + activity_score + rating_score
 
@@ -507,17 +619,20 @@ class OptimizedGrowthService:
         使用技能（优化版）
         """
         try:
-            # 检查技能是否存在且已解锁
-            skill = self.db.query(RoleSkill).filter(
+            # 一次查询同时锁定技能与所属角色，技能统计与经验更新在同一事务中提交
+            row = self.db.query(RoleSkill, Role).join(
+                Role, Role.id == RoleSkill.role_id
+            ).filter(
                 and_(
                     RoleSkill.role_id == role_id,
                     RoleSkill.skill_id == skill_id,
                     RoleSkill.is_unlocked == True
                 )
-            ).first()
+            ).with_for_update().first()
 
-            if not skill:
+            if not row:
                 return {"success": False, "message": "技能未解锁"}
+            skill, role = row
 
             # 更新技能使用统计
             skill.usage_count = (skill.usage_count or 0) + 1
@@ -543,9 +658,11 @@ class OptimizedGrowthService:
             # 获得经验值
             exp_gained = self.calculate_experience_for_skill_usage(skill_id, new_proficiency)
             if exp_gained > 0:
-                self.update_role_experience(role_id, exp_gained, GrowthEventType.SKILL_USAGE, {"skill_id": skill_id})
+                self._apply_experience(role, exp_gained, GrowthEventType.SKILL_USAGE, {"skill_id": skill_id})
 
             self.db.commit()
+            if exp_gained > 0:
+                self._clear_role_cache(role_id)
 
             return {
                 "success": True,
@@ -560,28 +677,27 @@ class OptimizedGrowthService:
 
     def _calculate_skill_proficiency_upgrade(self, usage_count: int, current_level: int) -> int:
         """计算技能熟练度升级"""
-        # 简化的熟练度升级公式
-        usage_thresholds = [5, 15, 30, 50, 75, 100, 150, 200, 300, 500]
-
-        for level, threshold in enumerate(usage_thresholds, 1):
-            if usage_count >= threshold:
-                current_level = level
-            else:
-                break
-
-        return min(current_level, 10)  # 最高10级
+        # 已达到的阈值个数即对应的熟练度，一个阈值都未达到时保持原等级
+        reached = bisect.bisect_right(_PROFICIENCY_THRESHOLDS, usage_count)
+        return min(reached or current_level, 10)  # 最高10级
 
     def clear_cache(self):
         """清除缓存"""
-        with self._cache_lock:
-            self._exp_cache.clear()
-            self._level_cache.clear()
+        try:
+            keys = list(_redis.scan_iter(match=_summary_key("*")))
+            if keys:
+                _redis.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"清除成长摘要缓存失败: {e}")
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计"""
-        with self._cache_lock:
-            return {
-                "exp_cache_size": len(self._exp_cache),
-                "level_cache_size": len(self._level_cache),
-                "cache_expire_minutes": self.config.EXP_CACHE_EXPIRE_MINUTES
-            }
\ No newline at end of file
+        try:
+            exp_cache_size = sum(1 for _ in _redis.scan_iter(match=_summary_key("*")))
+        except redis.RedisError as e:
+            logger.warning(f"读取成长摘要缓存统计失败: {e}")
+            exp_cache_size = 0
+        return {
+            "exp_cache_size": exp_cache_size,
+            "cache_expire_minutes": self.config.EXP_CACHE_EXPIRE_MINUTES
+        }
\ No newline at end of file
@@ -0,0 +1,154 @@
+from typing import Any, Dict, Iterable, List, Optional
+import orjson
+import redis
+
+from ..core.config import settings
+from ..models import Role
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+_redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+# 按经验值排序的角色有序集合，member 为 role_id，score 为经验值
+_LB_KEY = "growth:lb"
+# 排行榜完整性标记：只由全量重建写入，过期后 top() 返回 None，由调用方从数据库重建，
+# 绕过 GrowthService 的修改（迁移脚本、直接改库等）最多 _LB_TTL 秒后得到修正
+_LB_READY_KEY = "growth:lb:ready"
+_LB_TTL = 300
+# 有序集合与角色明细的过期时间，每次写入时续期，始终长于完整性标记
+_LB_DATA_TTL = _LB_TTL * 2
+
+
+class LeaderboardUnavailable(Exception):
+    """Redis 不可用，调用方应直接查询数据库，不要尝试重建排行榜"""
+
+
+def _key_role(role_id) -> str:
+    return f"growth:lb:role:{role_id}"
+
+
+# 综合排行榜快照：按统计周期分别保存为有序集合，member 为整行 JSON，score 为名次；
+# 过期后由下一次请求从数据库重建
+SNAPSHOT_SIZE = 100
+_SNAPSHOT_TTL = 60
+
+
+def _key_snapshot(period: str) -> str:
+    return f"growth:lb:snapshot:{period}"
+
+
+def _role_fields(role: Role) -> Dict[str, Any]:
+    return {
+        "role_name": role.name,
+        "level": role.level,
+        "experience": role.experience,
+        "total_conversations": role.total_conversations,
+        "positive_feedback": role.positive_feedback,
+        "negative_feedback": role.negative_feedback,
+    }
+
+
+def _add_roles(pipe, roles: Iterable[Role]) -> None:
+    for role in roles:
+        if role.total_conversations > 0:
+            key = _key_role(role.id)
+            pipe.zadd(_LB_KEY, {role.id: role.experience})
+            pipe.hset(key, mapping=_role_fields(role))
+            pipe.expire(key, _LB_DATA_TTL)
+        else:
+            pipe.zrem(_LB_KEY, role.id)
+    pipe.expire(_LB_KEY, _LB_DATA_TTL)
+
+
+def sync_roles(roles: Iterable[Role]) -> None:
+    """把角色的最新成长数据写入排行榜（仅收录有对话记录的角色），失败时忽略"""
+    try:
+        pipe = _redis.pipeline(transaction=False)
+        _add_roles(pipe, roles)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"同步排行榜失败: {e}")
+
+
+def rebuild(roles: Iterable[Role]) -> None:
+    """用数据库中的全部活跃角色整体替换排行榜并写入完整性标记，在事务中执行，失败时忽略"""
+    try:
+        pipe = _redis.pipeline(transaction=True)
+        pipe.delete(_LB_KEY)
+        _add_roles(pipe, roles)
+        pipe.set(_LB_READY_KEY, 1, ex=_LB_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"重建排行榜失败: {e}")
+
+
+def sync_role(role: Role) -> None:
+    sync_roles([role])
+
+
+def top(limit: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    按经验值读取前 limit 名角色，经验值相同时按 role_id 升序
+    排行榜尚未建立或已到期需要重建时返回 None；Redis 不可用时抛出 LeaderboardUnavailable
+    """
+    try:
+        if not _redis.exists(_LB_READY_KEY):
+            return None
+
+        # 有序集合对分数相同的成员按 member 字符串逆序排列（"9" 在 "10" 之前），
+        # 这里改为经验值相同时按 role_id 升序，与数据库重建时的排序一致；
+        # 第 limit 名有并列时补读所有并列成员后再截取
+        entries = _redis.zrevrange(_LB_KEY, 0, limit - 1, withscores=True)
+        if len(entries) == limit:
+            last_score = entries[-1][1]
+            tied = _redis.zrevrangebyscore(_LB_KEY, last_score, last_score)
+            entries = [e for e in entries if e[1] > last_score] + [(m, last_score) for m in tied]
+        entries.sort(key=lambda e: (-e[1], int(e[0])))
+        role_ids = [member for member, _ in entries[:limit]]
+
+        pipe = _redis.pipeline(transaction=False)
+        for role_id in role_ids:
+            pipe.hgetall(_key_role(role_id))
+        details = pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"读取排行榜失败: {e}")
+        raise LeaderboardUnavailable() from e
+
+    rows = []
+    for role_id, detail in zip(role_ids, details):
+        if not detail:
+            # 明细缺失说明缓存不完整，交给数据库重建
+            return None
+        row = {k: int(v) for k, v in detail.items() if k != "role_name"}
+        row["role_id"] = int(role_id)
+        row["role_name"] = detail["role_name"]
+        rows.append(row)
+    return rows
+
+
+def get_snapshot(period: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+    """按名次读取排行榜快照的前 limit 行，快照不存在或 Redis 不可用时返回 None"""
+    try:
+        members = _redis.zrange(_key_snapshot(period), 0, limit - 1)
+    except redis.RedisError as e:
+        logger.warning(f"读取排行榜快照失败: {e}")
+        return None
+    if not members:
+        return None
+    return [orjson.loads(member) for member in members]
+
+
+def save_snapshot(period: str, rows: List[Dict[str, Any]]) -> None:
+    """整体替换排行榜快照（rows 需含 rank 字段），在事务中执行，读取方不会看到半成品，失败时忽略"""
+    key = _key_snapshot(period)
+    try:
+        pipe = _redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if rows:
+            pipe.zadd(key, {orjson.dumps(row): row["rank"] for row in rows})
+            pipe.expire(key, _SNAPSHOT_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"写入排行榜快照失败: {e}")
@@ -0,0 +1,51 @@
+"""
+LLM回复缓存（确定性模式，需设置 LLM_CACHE_TTL_SEC 开启）
+按模型与完整消息列表精确匹配，不做语义相似度匹配
+"""
+
+from typing import Optional
+import hashlib
+import redis
+
+from ..core.config import settings
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+_redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+def enabled() -> bool:
+    """是否开启确定性模式；开启后请求使用 temperature=0，同样的输入得到同样的输出，回复才可以复用"""
+    return settings.llm_cache_ttl_sec > 0
+
+
+def temperature() -> float:
+    """发送给LLM的采样温度"""
+    return 0 if enabled() else settings.llm_temperature
+
+
+def _key(key_text: str) -> str:
+    # 忽略首尾空白与大小写差异，其余内容需完全一致才命中
+    normalized = " ".join(key_text.split()).casefold()
+    return "llm:reply:" + hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def lookup(key_text: str) -> Optional[str]:
+    """读取缓存的LLM回复，Redis 不可用时视为未命中"""
+    try:
+        return _redis.get(_key(key_text))
+    except redis.RedisError as e:
+        logger.warning(f"读取LLM回复缓存失败: {e}")
+        return None
+
+
+def store(key_text: str, response: str) -> None:
+    """写入LLM回复缓存，失败时忽略"""
+    if not response:
+        return
+    try:
+        _redis.set(_key(key_text), response, ex=settings.llm_cache_ttl_sec)
+    except redis.RedisError as e:
+        logger.warning(f"写入LLM回复缓存失败: {e}")
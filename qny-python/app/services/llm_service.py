@@ -1,17 +1,64 @@
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 import os
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from sqlalchemy.orm import Session
 from ..core.config import settings
 from ..models.role import Role
 from ..services.rag_service import rag
+from . import llm_cache
 
 
+# 进程内共享的 HTTP 会话：LLM 请求复用 keep-alive 连接，不必每次重新建立 TCP/TLS 连接
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+_http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+# RAG检索线程池：检索与读取角色系统提示并行进行
+_rag_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag")
+
+# 角色系统提示词的进程内缓存：role_id -> (过期时间, system_prompt)，超出容量时淘汰最早写入的条目
+_ROLE_PROMPT_TTL = 300
+_ROLE_PROMPT_MAXSIZE = 1024
+_role_prompt_cache: Dict[int, Tuple[float, Optional[str]]] = {}
+
+
+def _get_system_prompt(db: Session, role_id: int) -> Optional[str]:
+    """读取启用角色的系统提示词，命中缓存时不查询数据库"""
+    now = time.monotonic()
+    cached = _role_prompt_cache.get(role_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    system_prompt = db.query(Role.system_prompt).filter(Role.id == role_id, Role.is_active == True).scalar()
+
+    _role_prompt_cache.pop(role_id, None)
+    if len(_role_prompt_cache) >= _ROLE_PROMPT_MAXSIZE:
+        _role_prompt_cache.pop(next(iter(_role_prompt_cache), None), None)
+    _role_prompt_cache[role_id] = (now + _ROLE_PROMPT_TTL, system_prompt)
+    return system_prompt
+
+
+def invalidate_role_prompt(role_id: int) -> None:
+    """
+    角色创建、提示词或启用状态变更后清除本进程的缓存，应用内所有写入角色的接口都需调用；
+    其他进程中的修改（如 init_data.py 等脚本）在 _ROLE_PROMPT_TTL 秒后生效
+    """
+    _role_prompt_cache.pop(role_id, None)
+
+
+@lru_cache(maxsize=1)
 def get_llm_config():
     """
     获取LLM配置的统一函数
     返回: (api_key, api_url, model, use_rag)
+    环境变量在进程运行期间不变，首次调用后缓存结果；修改环境变量后需调用 get_llm_config.cache_clear()
     """
     # 直接使用真实LLM，不再检查开关
     use_rag = os.getenv('USE_RAG', 'true').lower() == 'true'
@@ -40,6 +87,251 @@ def get_llm_config():
     return api_key, api_url, model, use_rag
 
 
+def _search_docs(query: str) -> List[tuple]:
+    """RAG检索相关文档，失败时返回空列表"""
+    try:
+        relevant_docs = rag.search(query, top_k=3)
+        print(f"[RAG] 检索到 {len(relevant_docs)} 个相关文档")
+        return relevant_docs
+    except Exception as e:
+        print(f"[RAG] 检索失败: {e}")
+        return []
+
+
+# 聊天历史的长度预算（按字符计，中文文本下与 token 数大致相当）
+_HISTORY_CHAR_BUDGET = 4000
+
+
+def _truncate_history(messages: List[Dict[str, str]], budget: int = _HISTORY_CHAR_BUDGET) -> List[Dict[str, str]]:
+    """
+    从最新的消息往前保留，直到用完 budget 个字符，最新一条消息总会保留；
+    保留部分不以助手消息开头，避免截断后的历史缺少对应的用户提问
+    """
+    start = len(messages)
+    used = 0
+    while start > 0:
+        used += len(messages[start - 1]["content"])
+        if used > budget and start < len(messages):
+            break
+        start -= 1
+    while start < len(messages) - 1 and messages[start]["role"] == "assistant":
+        start += 1
+    return messages[start:]
+
+
+def _build_api_messages(messages: List[Dict[str, str]], role_id: Optional[int], db: Optional[Session],
+                        docs_future: Optional["Future[List[tuple]]"] = None) -> List[Dict[str, str]]:
+    """
+    构建发送给LLM的消息列表：角色系统提示（或默认提示，有RAG检索结果时附带背景知识）+ 聊天历史
+    docs_future 为进行中的RAG检索，只有使用默认提示时才等待其结果
+    """
+    # 读取角色系统提示，是否已有系统提示由该变量直接判断，不再检查消息列表
+    system_prompt = None
+    if role_id and db:
+        try:
+            system_prompt = _get_system_prompt(db, role_id)
+        except Exception as e:
+            print(f"获取角色信息失败: {e}")
+
+    if system_prompt:
+        if docs_future:
+            # 角色系统提示不附带背景知识，检索结果用不上，尚未开始的检索直接取消
+            docs_future.cancel()
+    else:
+        # 如果没有角色系统提示，使用默认提示
+        system_prompt = "你是一个智能助手，请根据用户的提问提供有帮助的回答。"
+        # 如果有RAG检索结果，构建增强的上下文
+        relevant_docs = docs_future.result() if docs_future else []
+        if relevant_docs:
+            system_prompt = build_rag_context(relevant_docs, system_prompt)
+
+    # 系统提示始终在最前，其后是聊天历史（只截断较早的部分）
+    api_messages = [{"role": "system", "content": system_prompt}]
+    api_messages.extend({"role": msg["role"], "content": msg["content"]} for msg in _truncate_history(messages))
+    return api_messages
+
+
+# 重试等待上限（秒）
+_MAX_BACKOFF = 8
+
+
+def _backoff_delay(attempt: int, response: Optional[requests.Response] = None) -> float:
+    """
+    第 attempt 次（从 0 开始）失败后的等待秒数：指数退避加随机抖动，不超过 _MAX_BACKOFF；
+    传入 429 响应时优先按 Retry-After 等待
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), _MAX_BACKOFF)
+    return min(2 ** attempt + random.random() * 0.3, _MAX_BACKOFF)
+
+
+def _post_llm(api_key: str, api_url: str, model: str, api_messages: List[Dict[str, str]],
+              log_prefix: str = "", stream: bool = False) -> requests.Response:
+    """
+    发送LLM请求并返回状态正常的响应，超时、网络错误、429 和 5xx 按配置指数退避重试，其余 4xx 直接失败
+    stream 为 True 时请求流式输出，响应体由调用方逐行读取
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    data = {
+        "model": model,
+        "messages": api_messages,
+        "max_tokens": 800,  # 减少token数量以提高响应速度
+        "temperature": llm_cache.temperature(),
+        "stream": stream
+    }
+
+    # 添加重试机制；llm_max_retries 为总尝试次数，配置为 0 或负数时仍至少请求一次，不会落空返回 None
+    attempts = max(settings.llm_max_retries, 1)
+    last_attempt = attempts - 1
+    for attempt in range(attempts):
+        try:
+            response = _http.post(api_url, headers=headers, json=data, timeout=settings.llm_timeout_sec, stream=stream)
+            response.raise_for_status()
+            return response
+
+        except requests.exceptions.Timeout:
+            print(f"{log_prefix}LLM API超时 (尝试 {attempt + 1}/{attempts}): {settings.llm_timeout_sec}s")
+            if attempt == last_attempt:
+                raise
+            time.sleep(_backoff_delay(attempt))
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code
+            print(f"{log_prefix}LLM API请求失败 (尝试 {attempt + 1}/{attempts}): {e}")
+            # 除 429 外的 4xx 是请求本身的问题（鉴权、参数等），重试也不会成功
+            if attempt == last_attempt or (status < 500 and status != 429):
+                raise
+            time.sleep(_backoff_delay(attempt, e.response if status == 429 else None))
+        except requests.exceptions.RequestException as e:
+            print(f"{log_prefix}LLM API请求失败 (尝试 {attempt + 1}/{attempts}): {e}")
+            if attempt == last_attempt:
+                raise
+            time.sleep(_backoff_delay(attempt))
+
+
+def _call_llm(api_key: str, api_url: str, model: str, api_messages: List[Dict[str, str]], log_prefix: str = "") -> str:
+    """
+    调用LLM API并返回完整回复内容
+    """
+    result = _post_llm(api_key, api_url, model, api_messages, log_prefix).json()
+    return result['choices'][0]['message']['content']
+
+
+# 进行中的非流式LLM请求：缓存键 -> 结果 Future。完全相同的请求并发到达时只向上游发送一次，其余请求等待同一结果
+_inflight: Dict[str, "Future[str]"] = {}
+_inflight_lock = threading.Lock()
+
+
+def _call_llm_coalesced(api_key: str, api_url: str, model: str, api_messages: List[Dict[str, str]],
+                        cache_key: str, log_prefix: str = "") -> str:
+    """
+    合并并发的相同请求后调用LLM API：第一个请求负责调用并发布结果（或异常），后续相同请求直接等待
+    """
+    with _inflight_lock:
+        future = _inflight.get(cache_key)
+        leader = future is None
+        if leader:
+            future = _inflight[cache_key] = Future()
+    if not leader:
+        return future.result()
+
+    try:
+        reply = _call_llm(api_key, api_url, model, api_messages, log_prefix)
+        future.set_result(reply)
+        return reply
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+
+
+def _iter_llm_stream(response: requests.Response) -> Iterator[str]:
+    """
+    解析OpenAI兼容接口的流式响应（SSE，每行 "data: {json}"，以 "data: [DONE]" 结束），逐段产出回复内容
+    """
+    with response:
+        # 按字节读取，避免 text/event-stream 未声明编码时被按 ISO-8859-1 解码
+        for line in response.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == b"[DONE]":
+                break
+            choices = orjson.loads(payload).get("choices")
+            if choices:
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+
+def _cache_key(model: str, api_messages: List[Dict[str, str]]) -> str:
+    """回复缓存的键文本：模型 + 完整消息列表（系统提示、RAG背景知识与聊天历史）"""
+    return orjson.dumps([model, api_messages]).decode()
+
+
+def _tee_to_cache(chunks: Iterator[str], cache_key: str) -> Iterator[str]:
+    """原样转发流式回复片段，完整输出结束后把拼接结果写入回复缓存"""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    llm_cache.store(cache_key, "".join(parts))
+
+
+def _prepare(messages: List[Dict[str, str]], role_id: Optional[int], db: Optional[Session],
+             use_rag: bool) -> Tuple[str, str, str, List[Dict[str, str]]]:
+    """
+    生成回复前的准备：按需RAG检索、读取LLM配置并构建消息列表
+    返回: (api_key, api_url, model, api_messages)
+    """
+    # 获取LLM配置
+    api_key, api_url, model, _ = get_llm_config()
+
+    # 如果没有配置API密钥，抛出异常
+    if not api_key:
+        raise ValueError("未配置LLM API密钥，请设置DASHSCOPE_API_KEY、OPENAI_API_KEY或LLM_API_KEY")
+
+    # RAG检索相关文档：在线程池中进行，同时在当前线程读取角色系统提示
+    docs_future = None
+    if use_rag and messages:
+        docs_future = _rag_executor.submit(_search_docs, messages[-1].get('content', ''))
+
+    return api_key, api_url, model, _build_api_messages(messages, role_id, db, docs_future)
+
+
+def _generate(messages: List[Dict[str, str]], role_id: Optional[int], db: Optional[Session], use_rag: bool) -> str:
+    """
+    生成回复的统一实现，use_rag 为 True 时先检索相关文档
+    """
+    log_prefix = "[RAG] " if use_rag else ""
+    api_key, api_url, model, api_messages = _prepare(messages, role_id, db, use_rag)
+
+    cache_key = _cache_key(model, api_messages)
+    use_cache = llm_cache.enabled()
+    if use_cache:
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        reply = _call_llm_coalesced(api_key, api_url, model, api_messages, cache_key, log_prefix)
+        if use_cache:
+            llm_cache.store(cache_key, reply)
+        return reply
+
+    except Exception as e:
+        # 如果API调用失败，抛出异常
+        print(f"{log_prefix}LLM API调用失败: {e}")
+        raise Exception(f"LLM API调用失败: {e}")
+
+
 def generate_reply_with_rag(messages: List[Dict[str, str]], role_id: Optional[int] = None, db: Session = None) -> str:
     """
     使用RAG增强的LLM生成回复
@@ -52,101 +344,18 @@ def generate_reply_with_rag(messages: List[Dict[str, str]], role_id: Optional[in
     Returns:
         str: AI回复内容
     """
-    # RAG检索相关文档
-    relevant_docs = []
-    try:
-        if messages:
-            last_message = messages[-1].get('content', '')
-            relevant_docs = rag.search(last_message, top_k=3)
-            print(f"[RAG] 检索到 {len(relevant_docs)} 个相关文档")
-    except Exception as e:
-        print(f"[RAG] 检索失败: {e}")
-    
-    # 获取LLM配置
-    api_key, api_url, model, use_rag = get_llm_config()
-    
-    # 如果没有配置API密钥，抛出异常
-    if not api_key:
-        raise ValueError("未配置LLM API密钥，请设置DASHSCOPE_API_KEY、OPENAI_API_KEY或LLM_API_KEY")
-    
-    try:
-        # 构建消息列表
-        api_messages = []
-        
-        # 添加角色系统提示
-        if role_id and db:
-            try:
-                role = db.query(Role).filter(Role.id == role_id, Role.is_active == True).first()
-                if role and role.system_prompt:
-                    # 添加角色系统提示
-                    api_messages.append({
-                        "role": "system",
-                        "content": role.system_prompt
-                    })
-            except Exception as e:
-                print(f"获取角色信息失败: {e}")
-        
-        # 如果没有角色系统提示，使用默认提示
-        if not api_messages:
-            default_prompt = "你是一个智能助手，请根据用户的提问提供有帮助的回答。"
-            # 如果有RAG检索结果，构建增强的上下文
-            if relevant_docs:
-                default_prompt = build_rag_context(relevant_docs, default_prompt)
-            api_messages.append({
-                "role": "system",
-                "content": default_prompt
-            })
-        
-        # 添加用户消息
-        for msg in messages:
-            api_messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-        
-        # 调用LLM API
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": model,
-            "messages": api_messages,
-            "max_tokens": 800,  # 减少token数量以提高响应速度
-            "temperature": 0.7,
-            "stream": False  # 确保不使用流式响应
-        }
-        
-        # 添加重试机制
-        for attempt in range(settings.llm_max_retries):
-            try:
-                response = requests.post(api_url, headers=headers, json=data, timeout=settings.llm_timeout_sec)
-                response.raise_for_status()
-                
-                result = response.json()
-                return result['choices'][0]['message']['content']
-                
-            except requests.exceptions.Timeout:
-                print(f"[RAG] LLM API超时 (尝试 {attempt + 1}/{settings.llm_max_retries}): {settings.llm_timeout_sec}s")
-                if attempt == settings.llm_max_retries - 1:
-                    raise
-                time.sleep(1)  # 等待1秒后重试
-            except requests.exceptions.RequestException as e:
-                print(f"[RAG] LLM API请求失败 (尝试 {attempt + 1}/{settings.llm_max_retries}): {e}")
-                if attempt == settings.llm_max_retries - 1:
-                    raise
-                time.sleep(1)  # 等待1秒后重试
-        
-    except Exception as e:
-        # 如果API调用失败，抛出异常
-        print(f"[RAG] LLM API调用失败: {e}")
-        raise Exception(f"LLM API调用失败: {e}")
+    return _generate(messages, role_id, db, use_rag=True)
+
+
+# RAG 背景知识的长度限制（按字符计，中文文本下与 token 数大致相当）：单篇摘录上限与所有摘录的总预算
+_RAG_SNIPPET_CHARS = 200
+_RAG_CONTEXT_BUDGET = 600
 
 
 def build_rag_context(relevant_docs: List[tuple], base_prompt: str = "") -> str:
     """
     构建包含RAG检索信息的上下文
+    每篇文档最多摘录 _RAG_SNIPPET_CHARS 个字符，按相关度依次摘录直到用完 _RAG_CONTEXT_BUDGET
     
     Args:
         relevant_docs: RAG检索结果列表 [(doc_id, content, score), ...]
@@ -158,15 +367,20 @@ def build_rag_context(relevant_docs: List[tuple], base_prompt: str = "") -> str:
     if not relevant_docs:
         return base_prompt
     
-    context_parts = [base_prompt]
-    context_parts.append("\n\n相关背景知识：")
-    
+    snippets = []
+    budget = _RAG_CONTEXT_BUDGET
     for i, (doc_id, content, score) in enumerate(relevant_docs, 1):
-        context_parts.append(f"\n{i}. {content[:200]}...")
-    
-    context_parts.append("\n\n请结合以上背景知识回答用户的问题。")
-    
-    return "".join(context_parts)
+        if budget <= 0:
+            break
+        snippet = content[:min(_RAG_SNIPPET_CHARS, budget)]
+        budget -= len(snippet)
+        # 只有确实截断时才加省略号
+        if len(snippet) < len(content):
+            snippet += "..."
+        snippets.append(f"{i}. {snippet}")
+
+    background = "\n".join(snippets)
+    return f"{base_prompt}\n\n相关背景知识：\n{background}\n\n请结合以上背景知识回答用户的问题。"
 
 
 def generate_reply_real_llm(messages: List[Dict[str, str]], role_id: Optional[int] = None, db: Session = None) -> str:
@@ -181,82 +395,7 @@ def generate_reply_real_llm(messages: List[Dict[str, str]], role_id: Optional[in
     Returns:
         str: AI回复内容
     """
-    # 获取LLM配置
-    api_key, api_url, model, use_rag = get_llm_config()
-
-    # 如果没有配置API密钥，抛出异常
-    if not api_key:
-        raise ValueError("未配置LLM API密钥，请设置DASHSCOPE_API_KEY、OPENAI_API_KEY或LLM_API_KEY")
-
-    try:
-        # 构建消息列表
-        api_messages = []
-
-        # 添加角色系统提示
-        if role_id and db:
-            try:
-                role = db.query(Role).filter(Role.id == role_id, Role.is_active == True).first()
-                if role and role.system_prompt:
-                    # 添加角色系统提示
-                    api_messages.append({
-                        "role": "system",
-                        "content": role.system_prompt
-                    })
-            except Exception as e:
-                print(f"获取角色信息失败: {e}")
-
-        # 如果没有角色系统提示，使用默认提示
-        if not api_messages:
-            api_messages.append({
-                "role": "system",
-                "content": "你是一个智能助手，请根据用户的提问提供有帮助的回答。"
-            })
-
-        # 添加用户消息
-        for msg in messages:
-            api_messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-
-        # 调用LLM API
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-
-        data = {
-            "model": model,
-            "messages": api_messages,
-            "max_tokens": 800,  # 减少token数量以提高响应速度
-            "temperature": 0.7,
-            "stream": False  # 确保不使用流式响应
-        }
-
-        # 添加重试机制
-        for attempt in range(settings.llm_max_retries):
-            try:
-                response = requests.post(api_url, headers=headers, json=data, timeout=settings.llm_timeout_sec)
-                response.raise_for_status()
-                
-                result = response.json()
-                return result['choices'][0]['message']['content']
-                
-            except requests.exceptions.Timeout:
-                print(f"LLM API超时 (尝试 {attempt + 1}/{settings.llm_max_retries}): {settings.llm_timeout_sec}s")
-                if attempt == settings.llm_max_retries - 1:
-                    raise
-                time.sleep(1)  # 等待1秒后重试
-            except requests.exceptions.RequestException as e:
-                print(f"LLM API请求失败 (尝试 {attempt + 1}/{settings.llm_max_retries}): {e}")
-                if attempt == settings.llm_max_retries - 1:
-                    raise
-                time.sleep(1)  # 等待1秒后重试
-
-    except Exception as e:
-        # 如果API调用失败，抛出异常
-        print(f"LLM API调用失败: {e}")
-        raise Exception(f"LLM API调用失败: {e}")
+    return _generate(messages, role_id, db, use_rag=False)
 
 
 def generate_reply(messages: List[Dict[str, str]], role_id: Optional[int] = None, db: Session = None) -> str:
@@ -271,12 +410,42 @@ def generate_reply(messages: List[Dict[str, str]], role_id: Optional[int] = None
     Returns:
         str: AI回复内容
     """
-    # 获取LLM配置
-    api_key, api_url, model, use_rag = get_llm_config()
+    # 获取LLM配置，按是否启用RAG走同一条生成路径
+    use_rag = get_llm_config()[3]
+    return _generate(messages, role_id, db, use_rag)
+
+
+def stream_reply(messages: List[Dict[str, str]], role_id: Optional[int] = None, db: Session = None) -> Iterator[str]:
+    """
+    流式生成AI回复，返回逐段产出回复内容的迭代器
+    检索、配置与连接阶段的错误在调用时立即抛出（连接失败按相同策略重试），开始输出后的错误在迭代中抛出
     
-    if use_rag:
-        # 使用RAG增强的回复生成
-        return generate_reply_with_rag(messages, role_id, db)
-    else:
-        # 使用真实LLM API（不包含RAG）
-        return generate_reply_real_llm(messages, role_id, db)
+    Args:
+        messages: 聊天历史记录
+        role_id: 角色ID
+        db: 数据库会话
+    
+    Returns:
+        Iterator[str]: AI回复内容片段
+    """
+    # 获取LLM配置中的RAG开关，其余配置由 _prepare 读取
+    use_rag = get_llm_config()[3]
+    log_prefix = "[RAG] " if use_rag else ""
+    api_key, api_url, model, api_messages = _prepare(messages, role_id, db, use_rag)
+
+    # 命中回复缓存时把缓存内容作为一个片段返回
+    cache_key = _cache_key(model, api_messages) if llm_cache.enabled() else None
+    if cache_key:
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return iter((cached,))
+
+    try:
+        response = _post_llm(api_key, api_url, model, api_messages, log_prefix, stream=True)
+    except Exception as e:
+        print(f"{log_prefix}LLM API调用失败: {e}")
+        raise Exception(f"LLM API调用失败: {e}")
+
+    if cache_key:
+        return _tee_to_cache(_iter_llm_stream(response), cache_key)
+    return _iter_llm_stream(response)
@@ -1,12 +1,13 @@
 from typing import List, Dict
-import json
 import time
+import orjson
 import redis
 
 from ..core.config import settings
 
 
-_redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+# 上下文条目以 UTF-8 JSON 字节存取，由 orjson 直接编解码，不经过 str
+_redis = redis.Redis.from_url(settings.redis_url, decode_responses=False)
 
 
 def _key_ctx(user_id: int, conversation_id: int) -> str:
@@ -14,22 +15,20 @@ def _key_ctx(user_id: int, conversation_id: int) -> str:
 
 
 def append_turn(user_id: int, conversation_id: int, role: str, content: str, max_rounds: int = 10) -> None:
-    item = json.dumps({"role": role, "content": content, "ts": int(time.time())}, ensure_ascii=False)
+    item = orjson.dumps({"role": role, "content": content, "ts": int(time.time())})
     key = _key_ctx(user_id, conversation_id)
-    print(f"[DEBUG] Storing to Redis: key={key}, role={role}, content={content[:50]}...")
-    _redis.rpush(key, item)
-    length = _redis.llen(key)
-    print(f"[DEBUG] Redis list length after append: {length}")
-    if length > max_rounds * 2:
-        _redis.ltrim(key, length - max_rounds * 2, -1)
-    _redis.expire(key, 60 * 60 * 24)
+    # 追加、截断到最近 max_rounds 轮、续期在一次往返中完成；ltrim 对未超长的列表不做任何修改
+    with _redis.pipeline(transaction=False) as pipe:
+        pipe.rpush(key, item)
+        pipe.ltrim(key, -max_rounds * 2, -1)
+        pipe.expire(key, 60 * 60 * 24)
+        pipe.execute()
 
 
 def get_recent_context(user_id: int, conversation_id: int, limit: int = 10) -> List[Dict[str, str]]:
     key = _key_ctx(user_id, conversation_id)
     items = _redis.lrange(key, -limit * 2, -1)
-    print(f"[DEBUG] Retrieving from Redis: key={key}, found {len(items)} items")
-    return [json.loads(x) for x in items]
+    return [orjson.loads(x) for x in items]
 
 
 def clear_context(user_id: int, conversation_id: int) -> None:
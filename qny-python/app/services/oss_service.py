@@ -2,6 +2,7 @@ import os
 import uuid
 from typing import Optional
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 
 try:
     import oss2
@@ -32,11 +33,10 @@ class OSSService:
         unique_filename = f"{uuid.uuid4()}{file_ext}"
         object_key = f"{folder}/{unique_filename}"
         
-        # 读取文件内容
-        content = await file.read()
-        
-        # 上传到 OSS
-        result = self.bucket.put_object(object_key, content)
+        # 上传到 OSS：直接传入底层文件对象由 oss2 分块读取，不把整个文件读入内存；
+        # oss2 是同步阻塞调用，放到线程池执行，不阻塞事件循环
+        await file.seek(0)
+        result = await run_in_threadpool(self.bucket.put_object, object_key, file.file)
         
         if result.status == 200:
             return f"{self.base_url}/{object_key}"
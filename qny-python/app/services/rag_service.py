@@ -1,6 +1,15 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import hashlib
+import os
+import joblib
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from ..core.config import settings
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
 
 
 class InMemoryRAG:
@@ -9,30 +18,84 @@ class InMemoryRAG:
         self.doc_ids: List[str] = []
         self.vectorizer = TfidfVectorizer(max_features=4096)
         self.matrix = None
+        # 当前索引对应文档集合的指纹，文档未变化时跳过重建
+        self.fingerprint: Optional[str] = None
 
     def index(self, doc_ids: List[str], documents: List[str]) -> None:
         self.doc_ids = doc_ids
         self.docs = documents
-        self.matrix = self.vectorizer.fit_transform(self.docs)
+        # 没有文档时无法拟合词表，search 对空索引直接返回空结果
+        self.matrix = self.vectorizer.fit_transform(self.docs) if self.docs else None
+
+    def save(self, path: str) -> None:
+        """把已拟合的索引写入文件，先写临时文件再替换，其他进程不会读到写了一半的文件"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump((self.fingerprint, self.vectorizer, self.matrix, self.doc_ids, self.docs), tmp_path, compress=3)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, fingerprint: str) -> bool:
+        """文件中的索引与 fingerprint 一致时加载并返回 True"""
+        if not os.path.exists(path):
+            return False
+        saved_fingerprint, vectorizer, matrix, doc_ids, docs = joblib.load(path)
+        if saved_fingerprint != fingerprint:
+            return False
+        self.vectorizer, self.matrix, self.doc_ids, self.docs = vectorizer, matrix, doc_ids, docs
+        self.fingerprint = fingerprint
+        return True
 
     def search(self, query: str, top_k: int = 3) -> List[Tuple[str, str, float]]:
         if not self.docs:
             return []
+        # TfidfVectorizer 默认对每行做 L2 归一化，余弦相似度即稀疏矩阵点积
         q = self.vectorizer.transform([query])
-        scores = cosine_similarity(q, self.matrix)[0]
-        ranked = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)[:top_k]
-        return [(self.doc_ids[i], self.docs[i], float(scores[i])) for i, _ in ranked]
+        scores = (self.matrix @ q.T).toarray().ravel()
+        # 先用 argpartition 选出前 top_k 个，只对这部分排序（分数相同时按文档顺序）
+        if top_k < len(scores):
+            idx = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            idx = np.arange(len(scores))
+        idx = idx[np.lexsort((idx, -scores[idx]))]
+        return [(self.doc_ids[i], self.docs[i], float(scores[i])) for i in idx]
 
 
 rag = InMemoryRAG()
 
 
+def _fingerprint(rows: List[Tuple[str, str]]) -> str:
+    digest = hashlib.sha256()
+    for doc_id, text in rows:
+        digest.update(doc_id.encode())
+        digest.update(b"\0")
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
 def rebuild_from_db(rows: List[Tuple[str, str]]) -> None:
-    if not rows:
-        rag.index([], [])
+    """
+    按数据库中的文档重建索引：文档与当前索引一致时直接返回，与持久化文件一致时加载文件，
+    否则重新拟合（词表与 IDF 依赖全部文档，有变化时需整体重建）并写回文件
+    """
+    fingerprint = _fingerprint(rows)
+    if fingerprint == rag.fingerprint:
         return
-    doc_ids = [r[0] for r in rows]
-    documents = [r[1] for r in rows]
-    rag.index(doc_ids, documents)
+
+    path = settings.rag_index_path
+    if path:
+        try:
+            if rag.load(path, fingerprint):
+                return
+        except Exception as e:
+            logger.warning(f"加载RAG索引文件失败: {e}")
+
+    rag.index([r[0] for r in rows], [r[1] for r in rows])
+    rag.fingerprint = fingerprint
+
+    if path and rows:
+        try:
+            rag.save(path)
+        except Exception as e:
+            logger.warning(f"保存RAG索引文件失败: {e}")
 
 
@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_, or_
+import heapq
 import json
 import math
 from collections import defaultdict, Counter
@@ -92,8 +93,8 @@ class RecommendationEngine:
 
     def _get_top_items(self, data: Dict[str, int], limit: int) -> List[Tuple[str, int]]:
         """获取排名前N的项目"""
-        sorted_items = sorted(data.items(), key=lambda x: x[1], reverse=True)
-        return sorted_items[:limit]
+        # 只取前 limit 个，不对全部项目排序；结果与 sorted(...)[:limit] 一致
+        return heapq.nlargest(limit, data.items(), key=lambda x: x[1])
 
     def get_collaborative_recommendations(self, user_id: int, limit: int = 5) -> List[Dict[str, Any]]:
         """基于协同过滤的推荐"""
@@ -124,7 +125,7 @@ class RecommendationEngine:
         recommended_roles = []
         max_score = max([score for _, score in recommendations.items()]) if recommendations else 1.0
 
-        for role_id, score in sorted(recommendations.items(), key=lambda x: x[1], reverse=True)[:limit]:
+        for role_id, score in heapq.nlargest(limit, recommendations.items(), key=lambda x: x[1]):
             role = self.db.query(Role).filter(Role.id == role_id).first()
             if role:
                 # 归一化分数到0-1范围
@@ -13,8 +13,6 @@ import json
 import math
 import numpy as np
 from collections import defaultdict, Counter
-from functools import lru_cache
-import threading
 from dataclasses import dataclass
 
 from ..models import User, Role, ChatSession, ChatMessage, UserRole
@@ -41,18 +39,18 @@ class OptimizedRecommendationEngine:
     def __init__(self, db: Session, config: Optional[RecommendationConfig] = None):
         self.db = db
         self.config = config or RecommendationConfig()
+        # 缓存只做单次字典读写或整体替换，这些操作在 GIL 下本身是原子的，不需要加锁
         self._user_behavior_cache = {}
         self._role_similarity_cache = {}
-        self._popular_roles_cache = None
-        self._popular_roles_cache_time = None
-        self._cache_lock = threading.Lock()
+        # (缓存时间, 热门角色列表)，整体替换
+        self._popular_roles_cache: Optional[Tuple[datetime, List[Dict[str, Any]]]] = None
 
     @retry_on_failure(max_attempts=3, delay=0.5)
     def get_user_behavior_analysis(self, user_id: int) -> Dict[str, Any]:
         """分析用户行为模式（优化版）"""
-        with self._cache_lock:
-            if self._is_cache_valid(user_id, self._user_behavior_cache):
-                return self._user_behavior_cache[user_id][1]
+        cached = self._get_cached(user_id, self._user_behavior_cache)
+        if cached is not None:
+            return cached
 
         # 使用更高效的查询
         user_sessions = self._get_user_sessions_optimized(user_id)
@@ -65,17 +63,19 @@ class OptimizedRecommendationEngine:
 
         user_profile = self._build_user_profile(user_id, user_sessions, role_info)
 
-        with self._cache_lock:
-            self._user_behavior_cache[user_id] = (datetime.now(), user_profile)
+        self._user_behavior_cache[user_id] = (datetime.now(), user_profile)
 
         return user_profile
 
-    def _is_cache_valid(self, key: int, cache: Dict) -> bool:
-        """检查缓存是否有效"""
-        if key not in cache:
-            return False
-        cache_time, _ = cache[key]
-        return datetime.now() - cache_time < timedelta(minutes=self.config.CACHE_EXPIRE_MINUTES)
+    def _get_cached(self, key: int, cache: Dict) -> Optional[Any]:
+        """读取未过期的缓存值，不存在或已过期时返回 None"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        cache_time, value = entry
+        if datetime.now() - cache_time < timedelta(minutes=self.config.CACHE_EXPIRE_MINUTES):
+            return value
+        return None
 
     def _get_user_sessions_optimized(self, user_id: int) -> List[ChatSession]:
         """优化的用户会话查询"""
@@ -309,17 +309,14 @@ class OptimizedRecommendationEngine:
 
     def get_popular_roles(self, limit: int = 10) -> List[Dict[str, Any]]:
         """获取热门角色（带缓存）"""
-        with self._cache_lock:
-            if (self._popular_roles_cache_time and
-                datetime.now() - self._popular_roles_cache_time < timedelta(minutes=15)):
-                return self._popular_roles_cache[:limit]
+        cached = self._popular_roles_cache
+        if cached and datetime.now() - cached[0] < timedelta(minutes=15):
+            return cached[1][:limit]
 
         # 计算热门角色
         popular_roles = self._calculate_popular_roles()
 
-        with self._cache_lock:
-            self._popular_roles_cache = popular_roles
-            self._popular_roles_cache_time = datetime.now()
+        self._popular_roles_cache = (datetime.now(), popular_roles)
 
         return popular_roles[:limit]
 
@@ -442,18 +439,15 @@ class OptimizedRecommendationEngine:
 
     def clear_cache(self):
         """清除缓存"""
-        with self._cache_lock:
-            self._user_behavior_cache.clear()
-            self._role_similarity_cache.clear()
-            self._popular_roles_cache = None
-            self._popular_roles_cache_time = None
+        self._user_behavior_cache.clear()
+        self._role_similarity_cache.clear()
+        self._popular_roles_cache = None
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
-        with self._cache_lock:
-            return {
-                "user_behavior_cache_size": len(self._user_behavior_cache),
-                "role_similarity_cache_size": len(self._role_similarity_cache),
-                "popular_roles_cache_valid": self._popular_roles_cache_time is not None,
-                "cache_expire_minutes": self.config.CACHE_EXPIRE_MINUTES
-            }
\ No newline at end of file
+        return {
+            "user_behavior_cache_size": len(self._user_behavior_cache),
+            "role_similarity_cache_size": len(self._role_similarity_cache),
+            "popular_roles_cache_valid": self._popular_roles_cache is not None,
+            "cache_expire_minutes": self.config.CACHE_EXPIRE_MINUTES
+        }
\ No newline at end of file
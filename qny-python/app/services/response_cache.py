@@ -0,0 +1,42 @@
+from typing import Optional
+import hashlib
+import redis
+
+from ..core.config import settings
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# 缓存的是已序列化的 JSON 字节，不做解码
+_redis = redis.Redis.from_url(settings.redis_url, decode_responses=False)
+
+DEFAULT_TTL = 60 * 60
+
+
+def make_etag(*parts) -> str:
+    """根据实体版本信息（如 id、updated_at）生成 ETag"""
+    raw = ":".join(str(p) for p in parts)
+    return '"' + hashlib.md5(raw.encode()).hexdigest() + '"'
+
+
+def _key(entity: str, etag: str) -> str:
+    digest = etag.strip('"')
+    return f"resp:{entity}:{digest}"
+
+
+def get_cached(entity: str, etag: str) -> Optional[bytes]:
+    """读取缓存的响应体，Redis 不可用时视为未命中"""
+    try:
+        return _redis.get(_key(entity, etag))
+    except redis.RedisError as e:
+        logger.warning(f"读取响应缓存失败: {e}")
+        return None
+
+
+def set_cached(entity: str, etag: str, body: bytes, ttl: int = DEFAULT_TTL) -> None:
+    """写入响应体缓存，失败时忽略"""
+    try:
+        _redis.set(_key(entity, etag), body, ex=ttl)
+    except redis.RedisError as e:
+        logger.warning(f"写入响应缓存失败: {e}")
@@ -221,14 +221,19 @@ class SceneService:
             self.db.add(saved_message)
             saved_messages.append(saved_message)
 
-        # 更新会话消息计数
-        session.message_count += len(saved_messages) + 1
-        session.updated_at = datetime.utcnow()
+        # 更新会话消息计数：在数据库端自增，避免并发消息读改写相互覆盖
+        values = {
+            SceneSession.message_count: SceneSession.message_count + len(saved_messages) + 1,
+            SceneSession.updated_at: datetime.utcnow(),
+        }
 
         # 更新当前发言者
         if saved_messages:
-            session.current_speaker = saved_messages[-1].role_id
+            values[SceneSession.current_speaker] = saved_messages[-1].role_id
 
+        self.db.query(SceneSession).filter(SceneSession.id == session.id).update(
+            values, synchronize_session=False
+        )
         self.db.commit()
 
         # 返回响应
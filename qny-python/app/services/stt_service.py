@@ -5,6 +5,10 @@ import base64
 from typing import Optional
 
 
+# 进程内共享的 HTTP 会话：语音服务请求复用 keep-alive 连接，不必每次重新建立 TCP/TLS 连接
+_http = requests.Session()
+
+
 def transcribe_audio_real(audio_bytes: bytes) -> str:
     """
     使用真实STT API进行语音转文字
@@ -66,7 +70,7 @@ def transcribe_audio_baidu(audio_bytes: bytes, app_id: str, api_key: str, secret
         }
         
         # 发送请求
-        response = requests.post(url, json=data, timeout=30)
+        response = _http.post(url, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -99,7 +103,7 @@ def get_baidu_access_token(api_key: str, secret_key: str) -> str:
         "client_secret": secret_key
     }
     
-    response = requests.post(url, params=params, timeout=30)
+    response = _http.post(url, params=params, timeout=30)
     response.raise_for_status()
     
     result = response.json()
@@ -131,7 +135,7 @@ def transcribe_audio_openai(audio_bytes: bytes, api_key: str) -> str:
         }
         
         # 发送请求
-        response = requests.post(api_url, files=files, headers=headers, timeout=30)
+        response = _http.post(api_url, files=files, headers=headers, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -10,6 +10,10 @@ from typing import Optional, Dict, Any
 from app.core.config import settings
 
 
+# 进程内共享的 HTTP 会话：语音服务请求复用 keep-alive 连接，不必每次重新建立 TCP/TLS 连接
+_http = requests.Session()
+
+
 def get_baidu_access_token(api_key: str, secret_key: str) -> str:
     """
     获取百度API访问令牌
@@ -28,7 +32,7 @@ def get_baidu_access_token(api_key: str, secret_key: str) -> str:
         "client_secret": secret_key
     }
     
-    response = requests.post(url, params=params, timeout=30)
+    response = _http.post(url, params=params, timeout=30)
     response.raise_for_status()
     
     result = response.json()
@@ -98,7 +102,7 @@ def synthesize_speech_real(text: str, voice: str = "longxiaochun", format: str =
         print(f"[TTS] 请求阿里云语音合成服务: text='{text[:50]}...', voice={voice}")
 
         # 发送请求
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = _http.post(url, headers=headers, json=payload, timeout=30)
 
         if response.status_code == 200:
             # 检查响应类型
@@ -223,7 +227,7 @@ def synthesize_speech_baidu(text: str, voice: str, format: str, rate: int, app_i
             "aue": 3 if format == "mp3" else 4
         }
         
-        response = requests.post(url, params=params, timeout=30)
+        response = _http.post(url, params=params, timeout=30)
         response.raise_for_status()
         
         content_type = response.headers.get('content-type', '')
@@ -261,7 +265,7 @@ def synthesize_speech_dashscope(text: str, voice: str, format: str, rate: int, a
             "parameters": {"voice": voice, "format": format, "sample_rate": rate}
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = _http.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -289,7 +293,7 @@ def synthesize_speech_openai(text: str, voice: str, format: str, rate: int, api_
             "response_format": format
         }
         
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = _http.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         
         return response.content
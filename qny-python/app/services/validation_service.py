@@ -30,13 +30,25 @@ class ValidationService:
         try:
             return model_class.model_validate(data)
         except PydanticValidationError as e:
-            error_messages = []
-            for error in e.errors():
-                field = " -> ".join(str(loc) for loc in error["loc"])
-                message = error["msg"]
-                error_messages.append(f"{field}: {message}")
+            raise ValidationError(self._format_validation_error(e))
 
-            raise ValidationError(f"数据验证失败: {'; '.join(error_messages)}")
+    def validate_model_json(self, model_class: Type[BaseModel], raw: Union[str, bytes]) -> BaseModel:
+        """直接从原始JSON验证Pydantic模型数据（解析与校验一次完成，无需先 json.loads）"""
+        try:
+            return model_class.model_validate_json(raw)
+        except PydanticValidationError as e:
+            raise ValidationError(self._format_validation_error(e))
+
+    @staticmethod
+    def _format_validation_error(e: PydanticValidationError) -> str:
+        """格式化Pydantic验证错误信息"""
+        error_messages = []
+        for error in e.errors():
+            field = " -> ".join(str(loc) for loc in error["loc"])
+            message = error["msg"]
+            error_messages.append(f"{field}: {message}")
+
+        return f"数据验证失败: {'; '.join(error_messages)}"
 
     def sanitize_string_input(self, input_string: str, max_length: int = 1000, allow_html: bool = False) -> str:
         """清理字符串输入"""
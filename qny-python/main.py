@@ -1,9 +1,8 @@
 import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy import text
+from sqlalchemy import select, text
 
 from app.core.config import settings
 from app.core.db import Base, engine
@@ -14,7 +13,8 @@ from app.core.middleware import (
     MetricsMiddleware
 )
 from app.core.exceptions import BaseAPIException
-from app.core.response import APIResponse
+from app.core.response import APIResponse, ORJSONResponse
+from app.schemas import warm_schemas
 from app.routers import auth as auth_router
 from app.routers import chat as chat_router
 from app.routers import role as role_router
@@ -32,7 +32,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title=settings.app_name,
     description="AI角色扮演平台后端API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # 添加中间件
@@ -55,14 +56,14 @@ async def api_exception_handler(request: Request, exc: BaseAPIException):
     logger.error(f"API异常: {exc.status_code} - {exc.detail}")
     request_id = getattr(request.state, 'request_id', None)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=APIResponse.error(
             message=exc.detail,
             code=exc.error_code,
             data=exc.extra_data,
             request_id=request_id
-        ).dict()
+        ).model_dump()
     )
 
 
@@ -71,13 +72,13 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     logger.error(f"HTTP异常: {exc.status_code} - {exc.detail}")
     request_id = getattr(request.state, 'request_id', None)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=APIResponse.error(
             message=exc.detail,
             code=exc.status_code,
             request_id=request_id
-        ).dict()
+        ).model_dump()
     )
 
 
@@ -86,13 +87,13 @@ async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"未处理的异常: {str(exc)}", exc_info=True)
     request_id = getattr(request.state, 'request_id', None)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=APIResponse.error(
             message="服务器内部错误",
             code=500,
             request_id=request_id
-        ).dict()
+        ).model_dump()
     )
 
 
@@ -115,8 +116,18 @@ def on_startup():
                 "CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_id ON chat_sessions(user_id)",
                 "CREATE INDEX IF NOT EXISTS idx_chat_sessions_role_id ON chat_sessions(role_id)",
                 "CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id)",
+                # 会话列表按 user_id[/role_id] 过滤、updated_at 倒序；消息按 session_id 过滤、created_at 正序
+                "CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_updated ON chat_sessions(user_id, updated_at)",
+                "CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_role_updated ON chat_sessions(user_id, role_id, updated_at)",
+                "CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created ON chat_messages(session_id, created_at)",
                 "CREATE INDEX IF NOT EXISTS idx_user_feedback_user_id ON user_feedback(user_id)",
                 "CREATE INDEX IF NOT EXISTS idx_role_skills_role_id ON role_skills(role_id)",
+                # 技能按 role_id + skill_name 定位，按 role_id + is_unlocked 查找待解锁技能
+                "CREATE INDEX IF NOT EXISTS idx_role_skills_role_name ON role_skills(role_id, skill_name)",
+                "CREATE INDEX IF NOT EXISTS idx_role_skills_role_unlocked ON role_skills(role_id, is_unlocked)",
+                # 成长趋势按 role_id 过滤 created_at 范围；反馈统计按 role_id 过滤、按 feedback_type 聚合，rating 作为末列使查询只读索引
+                "CREATE INDEX IF NOT EXISTS idx_chat_sessions_role_created ON chat_sessions(role_id, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_user_feedback_role_type_rating ON user_feedback(role_id, feedback_type, rating)",
             ]
             
             for index_sql in indexes:
@@ -138,13 +149,16 @@ def on_startup():
         
         with engine.connect() as conn:
             rows = conn.execute(
-                Document.__table__.select().with_only_columns([Document.doc_id, Document.text])
+                select(Document.doc_id, Document.text)
             ).fetchall()
             rebuild_from_db(rows)
         logger.info("✅ RAG 索引重建完成")
     except Exception as e:
         logger.warning(f"RAG 索引重建失败: {e}")
 
+    # 4. 预先完成 schema 构建，避免首个请求承担构建开销
+    warm_schemas()
+
     logger.info("🎉 应用启动初始化完成！")
 
 @app.get("/")
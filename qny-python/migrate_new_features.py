@@ -57,10 +57,20 @@ def migrate_new_features():
                     "CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_id ON chat_sessions(user_id)",
                     "CREATE INDEX IF NOT EXISTS idx_chat_sessions_role_id ON chat_sessions(role_id)",
                     "CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id)",
+                    # 会话列表按 user_id[/role_id] 过滤、updated_at 倒序；消息按 session_id 过滤、created_at 正序
+                    "CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_updated ON chat_sessions(user_id, updated_at)",
+                    "CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_role_updated ON chat_sessions(user_id, role_id, updated_at)",
+                    "CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created ON chat_messages(session_id, created_at)",
                     "CREATE INDEX IF NOT EXISTS idx_chat_messages_user_id ON chat_messages(user_id)",
                     "CREATE INDEX IF NOT EXISTS idx_user_feedback_user_id ON user_feedback(user_id)",
                     "CREATE INDEX IF NOT EXISTS idx_user_feedback_role_id ON user_feedback(role_id)",
                     "CREATE INDEX IF NOT EXISTS idx_role_skills_role_id ON role_skills(role_id)",
+                    # 技能按 role_id + skill_name 定位，按 role_id + is_unlocked 查找待解锁技能
+                    "CREATE INDEX IF NOT EXISTS idx_role_skills_role_name ON role_skills(role_id, skill_name)",
+                    "CREATE INDEX IF NOT EXISTS idx_role_skills_role_unlocked ON role_skills(role_id, is_unlocked)",
+                    # 成长趋势按 role_id 过滤 created_at 范围；反馈统计按 role_id 过滤、按 feedback_type 聚合，rating 作为末列使查询只读索引
+                    "CREATE INDEX IF NOT EXISTS idx_chat_sessions_role_created ON chat_sessions(role_id, created_at)",
+                    "CREATE INDEX IF NOT EXISTS idx_user_feedback_role_type_rating ON user_feedback(role_id, feedback_type, rating)",
                     "CREATE INDEX IF NOT EXISTS idx_scene_sessions_user_id ON scene_sessions(user_id)",
                     "CREATE INDEX IF NOT EXISTS idx_scene_participants_session_id ON scene_participants(session_id)",
                 ]
@@ -4,7 +4,7 @@
 """
 
 from typing import Dict, List, Any
-from app.schemas.role import RoleTemplate
+from app.schemas.role import RoleTemplate, RoleInfo
 
 # 预设角色模板库
 ROLE_TEMPLATES: Dict[str, RoleTemplate] = {
@@ -242,3 +242,24 @@ BUILTIN_ROLES = {
     }
     for name, template in ROLE_TEMPLATES.items()
 }
+
+# 内置角色的 RoleInfo 常量：数据来自上面已校验过的模板，导入时用 model_construct 直接构建，
+# 接口中按名称取用即可，不再逐次校验（用户输入仍须走正常校验）
+BUILTIN_ROLE_INFOS: Dict[str, RoleInfo] = {
+    name: RoleInfo.model_construct(
+        id=None,
+        name=name,
+        display_name=info["display_name"],
+        description=info["description"],
+        avatar_url=info["avatar_url"],
+        skills=info["skills"],
+        background=info["background"],
+        personality=info["personality"],
+        is_builtin=True,
+        category=info["category"],
+        tags=info["tags"],
+        is_public=True,
+        created_at=None
+    )
+    for name, info in BUILTIN_ROLES.items()
+}